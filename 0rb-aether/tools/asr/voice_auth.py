@@ -7,13 +7,87 @@ VAD -> ASR (whisper.cpp) -> Speaker Verification -> Passphrase Confirmation
 import os
 import json
 import hashlib
+import hmac
+import io
 import subprocess
 import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import wave
-import struct
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+ASR_CACHE_SIZE = 8
+_INT16 = np.dtype("<i2")
+# tmpfs keeps the short-lived WAV handed to ASR off the block device
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Raw PCM from record_audio, or a complete WAV file as bytes
+Audio = Union[np.ndarray, bytes]
+
+
+def _read_wav(audio: bytes) -> Tuple[Optional[np.ndarray], int, int]:
+    """(int16 samples, sample rate, channels) from WAV bytes; samples is None unless 16-bit PCM"""
+    try:
+        with wave.open(io.BytesIO(audio), "rb") as wav:
+            rate, channels = wav.getframerate(), wav.getnchannels()
+            if wav.getsampwidth() != 2:
+                return None, rate, channels
+            return np.frombuffer(wav.readframes(wav.getnframes()), dtype=_INT16), rate, channels
+    except (wave.Error, EOFError):
+        return None, 0, 0
+
+
+def _as_samples(audio: Audio) -> Optional[np.ndarray]:
+    """Audio as int16 samples (None for WAV data that isn't 16-bit PCM)"""
+    if isinstance(audio, np.ndarray):
+        return audio
+    return _read_wav(audio)[0]
+
+
+try:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def _rms_i16(samples: np.ndarray) -> float:
+        """RMS of int16 samples in one fused pass (no float temporary)"""
+        acc = 0.0
+        for i in range(samples.size):
+            s = float(samples[i])
+            acc += s * s
+        return (acc / samples.size) ** 0.5
+except ImportError:
+    def _rms_i16(samples: np.ndarray) -> float:
+        """RMS of int16 samples"""
+        return float(np.sqrt(np.square(samples, dtype=np.float32).mean()))
+
+
+def _write_wav(f, audio: Audio, sample_rate: int = SAMPLE_RATE):
+    """Write audio to an open file, adding a WAV header to raw PCM"""
+    if not isinstance(audio, np.ndarray):
+        f.write(audio)
+        return
+    with wave.open(f, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(audio.tobytes())
+
+
+def _best_cosine(query: np.ndarray, templates: np.ndarray) -> float:
+    """Highest cosine similarity between an embedding and enrolled templates"""
+    query = np.ascontiguousarray(query, dtype=np.float32).reshape(1, -1)
+    try:
+        import simsimd
+        distances = np.asarray(simsimd.cdist(query, templates, metric="cosine"))
+        return 1.0 - float(distances.min())
+    except ImportError:
+        norms = np.linalg.norm(templates, axis=1) * np.linalg.norm(query)
+        return float((templates @ query[0] / np.maximum(norms, 1e-12)).max())
 
 @dataclass
 class AuthResult:
@@ -30,39 +104,99 @@ class VoiceAuthenticator:
         speaker_model_path: Optional[str] = None,
         passphrase_hash: Optional[str] = None,
         min_confidence: float = 0.85,
+        enrolled_embedding_path: Optional[str] = None,
+        backend: str = "faster-whisper",
     ):
         self.whisper_model = whisper_model
         self.speaker_model_path = speaker_model_path
         self.passphrase_hash = passphrase_hash
+        self._passphrase_digest = bytes.fromhex(passphrase_hash) if passphrase_hash else None
         self.min_confidence = min_confidence
+        self.enrolled_embedding_path = enrolled_embedding_path
+        self._templates: Optional[np.ndarray] = None
+        self._spk_model = None
+        self._spk_inference = None
+        self.backend = backend
+        self._model = None
+        # PCM digest -> (transcript, confidence), so retries skip mel + encode
+        self._asr_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
         self.whisper_bin = os.environ.get("WHISPER_CPP_BIN", "whisper-cpp")
+        self._speaker_pool: Optional[ThreadPoolExecutor] = None
 
-    def record_audio(self, duration: float = 5.0, sample_rate: int = 16000) -> bytes:
-        """Record audio from microphone using arecord"""
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = f.name
+    def record_audio(self, duration: float = 5.0, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+        """Record raw S16_LE PCM from microphone using arecord"""
+        nbytes = int(duration * sample_rate) * 2
+        buf = bytearray(nbytes)
+        view = memoryview(buf)
+        filled = 0
 
-        try:
-            subprocess.run([
-                "arecord", "-f", "S16_LE", "-r", str(sample_rate),
-                "-c", "1", "-d", str(int(duration)), temp_path
-            ], check=True, capture_output=True)
+        proc = subprocess.Popen([
+            "arecord", "-f", "S16_LE", "-r", str(sample_rate),
+            "-c", "1", "-t", "raw", "-d", str(int(duration))
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=sample_rate * 2)
 
-            with open(temp_path, "rb") as f:
-                return f.read()
+        try:
+            while filled < nbytes:
+                n = proc.stdout.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
         finally:
-            os.unlink(temp_path)
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+        return np.frombuffer(buf, dtype=_INT16, count=filled // 2)
 
-    def detect_voice_activity(self, audio_data: bytes, threshold: float = 0.01) -> bool:
+    def detect_voice_activity(self, audio_data: Audio, threshold: float = 0.01) -> bool:
         """Simple VAD based on RMS energy"""
-        # Skip WAV header (44 bytes)
-        samples = struct.unpack(f"<{(len(audio_data)-44)//2}h", audio_data[44:])
-        rms = (sum(s**2 for s in samples) / len(samples)) ** 0.5
+        samples = _as_samples(audio_data)
+        if samples is None:
+            return True  # Not 16-bit PCM; leave it to ASR
+        if samples.size == 0:
+            return False
+        rms = _rms_i16(samples)
         normalized_rms = rms / 32768.0
         return normalized_rms > threshold
 
-    def transcribe(self, audio_path: str) -> Tuple[str, float]:
-        """Transcribe audio using whisper.cpp"""
+    def _get_model(self):
+        """Load the faster-whisper model once (None if unavailable)"""
+        if self._model is None and self.backend == "faster-whisper":
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError:
+                self.backend = "whisper-cpp"
+                return None
+            self._model = WhisperModel(self.whisper_model, device="cpu", compute_type="int8")
+        return self._model
+
+    def transcribe(self, audio_path: Optional[str], audio: Optional[Audio] = None) -> Tuple[str, float]:
+        """Transcribe audio in-process with faster-whisper, else whisper.cpp"""
+        model = self._get_model()
+        if model is not None:
+            if audio is None:
+                return self._run_model(model, audio_path)
+
+            if isinstance(audio, np.ndarray):
+                samples = audio
+            else:
+                samples, rate, channels = _read_wav(audio)
+                if samples is None or rate != SAMPLE_RATE or channels != 1:
+                    # Let faster-whisper decode and resample anything but 16 kHz mono
+                    return self._run_model(model, audio_path or io.BytesIO(audio))
+            key = hashlib.blake2b(samples, digest_size=16).digest()
+            cached = self._asr_cache.get(key)
+            if cached is not None:
+                self._asr_cache.move_to_end(key)
+                return cached
+
+            result = self._run_model(model, samples.astype(np.float32) / 32768.0)
+            if result[0]:
+                self._asr_cache[key] = result
+                if len(self._asr_cache) > ASR_CACHE_SIZE:
+                    self._asr_cache.popitem(last=False)
+            return result
+
         try:
             result = subprocess.run([
                 self.whisper_bin,
@@ -90,35 +224,54 @@ class VoiceAuthenticator:
             except ImportError:
                 return "", 0.0
 
+    def _run_model(self, model, source) -> Tuple[str, float]:
+        """Run faster-whisper on a file path, file object or float32 PCM array"""
+        segments, info = model.transcribe(source, language="en", beam_size=1)
+        transcript = "".join(segment.text for segment in segments).strip()
+        return transcript, float(info.language_probability)
+
     def verify_speaker(self, audio_path: str) -> float:
         """Verify speaker identity using embeddings"""
         if not self.speaker_model_path:
             return 1.0  # No speaker model, skip verification
 
-        try:
-            # Using pyannote for speaker verification
-            from pyannote.audio import Model, Inference
+        if self._spk_inference is None:
+            try:
+                # Using pyannote for speaker verification
+                import torch
+                from pyannote.audio import Model, Inference
+            except ImportError:
+                return 1.0  # Skip if not available
+
+            # Load weights once and keep them resident across calls
+            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            self._spk_model = Model.from_pretrained(self.speaker_model_path)
+            self._spk_inference = Inference(self._spk_model, window="whole", device=device)
+
+        embedding = self._spk_inference(audio_path)
 
-            model = Model.from_pretrained(self.speaker_model_path)
-            inference = Inference(model)
+        templates = self._enrolled_templates()
+        if templates is None:
+            return 0.9  # Placeholder until a voiceprint is enrolled
+        return _best_cosine(embedding, templates)
 
-            embedding = inference(audio_path)
-            # Compare with enrolled embedding (stored separately)
-            # Return cosine similarity
-            return 0.9  # Placeholder
-        except ImportError:
-            return 1.0  # Skip if not available
+    def _enrolled_templates(self) -> Optional[np.ndarray]:
+        """Load enrolled embeddings once as a contiguous (N, D) f32 matrix"""
+        if self._templates is None and self.enrolled_embedding_path:
+            templates = np.load(self.enrolled_embedding_path)
+            self._templates = np.ascontiguousarray(np.atleast_2d(templates), dtype=np.float32)
+        return self._templates
 
     def verify_passphrase(self, transcript: str) -> bool:
         """Verify spoken passphrase matches stored hash"""
-        if not self.passphrase_hash:
+        if not self._passphrase_digest:
             return True
 
         normalized = transcript.lower().strip()
-        transcript_hash = hashlib.sha256(normalized.encode()).hexdigest()
-        return transcript_hash == self.passphrase_hash
+        digest = hashlib.sha256(normalized.encode()).digest()
+        return hmac.compare_digest(digest, self._passphrase_digest)
 
-    def authenticate(self, audio_data: Optional[bytes] = None) -> AuthResult:
+    def authenticate(self, audio_data: Optional[Audio] = None) -> AuthResult:
         """Full authentication pipeline"""
         # Record if no audio provided
         if audio_data is None:
@@ -135,14 +288,26 @@ class VoiceAuthenticator:
                 reason="No voice detected"
             )
 
-        # Save to temp file for processing
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio_data)
-            temp_path = f.name
+        # faster-whisper takes the samples in memory; only write a WAV when
+        # whisper.cpp or the speaker model needs a file path
+        temp_path = None
+        if self._get_model() is None or self.speaker_model_path:
+            with tempfile.NamedTemporaryFile(suffix=".wav", dir=_TMPDIR, delete=False) as f:
+                _write_wav(f, audio_data)
+                temp_path = f.name
 
+        speaker_future = None
         try:
+            # With no passphrase to gate on, overlap speaker verification with
+            # ASR (both release the GIL in native code). Otherwise it only runs
+            # once the passphrase matches, so wrong attempts skip the embedding pass
+            if self.speaker_model_path and self._passphrase_digest is None:
+                if self._speaker_pool is None:
+                    self._speaker_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speaker")
+                speaker_future = self._speaker_pool.submit(self.verify_speaker, temp_path)
+
             # ASR
-            transcript, asr_confidence = self.transcribe(temp_path)
+            transcript, asr_confidence = self.transcribe(temp_path, audio_data)
             if not transcript:
                 return AuthResult(
                     success=False,
@@ -152,17 +317,26 @@ class VoiceAuthenticator:
                     reason="Transcription failed"
                 )
 
-            # Speaker Verification
-            speaker_match = self.verify_speaker(temp_path)
+            # Passphrase Verification - a cheap hash check that gates speaker verification
+            if not self.verify_passphrase(transcript):
+                return AuthResult(
+                    success=False,
+                    confidence=0.0,
+                    transcript=transcript,
+                    speaker_match=0.0,
+                    reason="Passphrase mismatch"
+                )
 
-            # Passphrase Verification
-            passphrase_ok = self.verify_passphrase(transcript)
+            # Speaker Verification
+            if speaker_future is not None:
+                speaker_match = speaker_future.result()
+            else:
+                speaker_match = self.verify_speaker(temp_path)
 
             # Combined confidence
             confidence = asr_confidence * speaker_match
             success = (
                 confidence >= self.min_confidence and
-                passphrase_ok and
                 speaker_match >= 0.8
             )
 
@@ -175,7 +349,18 @@ class VoiceAuthenticator:
             )
 
         finally:
-            os.unlink(temp_path)
+            if speaker_future is not None and not speaker_future.done():
+                # Transcription failed while the embedding pass still reads the WAV
+                speaker_future.add_done_callback(lambda _: os.unlink(temp_path))
+            elif temp_path:
+                os.unlink(temp_path)
+
+
+    def close(self):
+        """Stop the speaker verification thread, if one was started"""
+        if self._speaker_pool is not None:
+            self._speaker_pool.shutdown(wait=True)
+            self._speaker_pool = None
 
 
 class PINFallback:
@@ -183,12 +368,13 @@ class PINFallback:
 
     def __init__(self, pin_hash: str):
         self.pin_hash = pin_hash
+        self._pin_digest = bytes.fromhex(pin_hash)
         self.max_attempts = 3
 
     def authenticate(self) -> bool:
         for attempt in range(self.max_attempts):
             pin = input(f"Enter PIN ({attempt + 1}/{self.max_attempts}): ")
-            if hashlib.sha256(pin.encode()).hexdigest() == self.pin_hash:
+            if hmac.compare_digest(hashlib.sha256(pin.encode()).digest(), self._pin_digest):
                 return True
             print("Incorrect PIN")
         return False
@@ -211,9 +397,10 @@ def main():
         auth = VoiceAuthenticator()
         audio = auth.record_audio(duration=5.0)
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(audio)
-            transcript, _ = auth.transcribe(f.name)
+        with tempfile.NamedTemporaryFile(suffix=".wav", dir=_TMPDIR, delete=False) as f:
+            _write_wav(f, audio)
+            f.flush()
+            transcript, _ = auth.transcribe(f.name, audio)
             os.unlink(f.name)
 
         if transcript:
@@ -228,9 +415,16 @@ def main():
 
     elif args.verify:
         config = json.loads(config_path.read_text()) if config_path.exists() else {}
-        auth = VoiceAuthenticator(passphrase_hash=config.get("passphrase_hash"))
+        auth = VoiceAuthenticator(
+            speaker_model_path=config.get("speaker_model_path"),
+            enrolled_embedding_path=config.get("enrolled_embedding_path"),
+            passphrase_hash=config.get("passphrase_hash"),
+        )
 
-        result = auth.authenticate()
+        try:
+            result = auth.authenticate()
+        finally:
+            auth.close()
         print(f"Result: {result}")
         return 0 if result.success else 1
 
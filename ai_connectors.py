@@ -8,7 +8,70 @@ Plug into Brain OS router
 import os
 import time
 import json
-from typing import Dict, Optional
+import asyncio
+from dataclasses import dataclass, asdict
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# =============================================================================
+# SHARED HTTP CLIENT
+# =============================================================================
+
+_SHARED_CLIENT = None
+
+async def _get_client():
+    """Lazily create the pooled client reused by every provider"""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        import httpx
+        
+        limits = httpx.Limits(max_keepalive_connections=20)
+        try:
+            _SHARED_CLIENT = httpx.AsyncClient(http2=True, limits=limits, timeout=60)
+        except ImportError:
+            # h2 not installed - still pool connections over HTTP/1.1
+            _SHARED_CLIENT = httpx.AsyncClient(limits=limits, timeout=60)
+    return _SHARED_CLIENT
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BACKOFF = (0.2, 0.8)
+
+async def _post_with_retry(url: str, *, headers: Dict, content: bytes, budget_s: float = 60) -> "httpx.Response":
+    """POST, retrying 429/5xx and timeouts with backoff inside one time budget"""
+    import httpx
+    
+    client = await _get_client()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget_s
+    
+    for backoff in RETRY_BACKOFF + (None,):
+        try:
+            response = await asyncio.wait_for(
+                client.post(url, headers=headers, content=content),
+                timeout=deadline - loop.time()
+            )
+            response.raise_for_status()
+            return response
+        except (httpx.HTTPStatusError, httpx.TimeoutException, asyncio.TimeoutError) as e:
+            retryable = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in RETRY_STATUSES
+            if backoff is None or not retryable or deadline - loop.time() <= backoff:
+                raise
+            await asyncio.sleep(backoff)
+
+def _estimate_tokens(text: str) -> int:
+    """Rough word count via a C-level scan, no list of words allocated"""
+    return text.count(" ") + 1 if text else 0
 
 # =============================================================================
 # API CLIENTS
@@ -18,25 +81,28 @@ class ClaudeClient:
     """Anthropic Claude API"""
     
     def __init__(self):
-        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        self._api_key_env = "ANTHROPIC_API_KEY"
+        self.api_key = None  # Resolved on first generate()
         self.model = "claude-sonnet-4-20250514"
         self.base_url = "https://api.anthropic.com/v1/messages"
+        self._headers = None
         
     def is_configured(self) -> bool:
-        return bool(self.api_key)
+        return bool(os.environ.get(self._api_key_env))
     
     async def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7) -> Dict:
+        if not self.api_key:
+            self.api_key = os.environ.get(self._api_key_env)
         if not self.api_key:
             return {"error": "ANTHROPIC_API_KEY not set", "provider": "claude"}
         
         try:
-            import httpx
-            
-            headers = {
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            }
+            if self._headers is None:
+                self._headers = {
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json"
+                }
             
             payload = {
                 "model": self.model,
@@ -45,10 +111,8 @@ class ClaudeClient:
             }
             
             start = time.time()
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.base_url, headers=headers, json=payload, timeout=60)
-                response.raise_for_status()
-                data = response.json()
+            response = await _post_with_retry(self.base_url, headers=self._headers, content=_dumps(payload))
+            data = _loads(response.content)
             
             latency = time.time() - start
             
@@ -69,21 +133,24 @@ class GeminiClient:
     """Google Gemini API"""
     
     def __init__(self):
-        self.api_key = os.getenv("GOOGLE_API_KEY")
+        self._api_key_env = "GOOGLE_API_KEY"
+        self.api_key = None  # Resolved on first generate()
         self.model = "gemini-1.5-pro"
         self.base_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
+        self._gen_url = None
     
     def is_configured(self) -> bool:
-        return bool(self.api_key)
+        return bool(os.environ.get(self._api_key_env))
     
     async def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7) -> Dict:
+        if not self.api_key:
+            self.api_key = os.environ.get(self._api_key_env)
         if not self.api_key:
             return {"error": "GOOGLE_API_KEY not set", "provider": "gemini"}
         
         try:
-            import httpx
-            
-            url = f"{self.base_url}?key={self.api_key}"
+            if self._gen_url is None:
+                self._gen_url = f"{self.base_url}?key={self.api_key}"
             
             payload = {
                 "contents": [{"parts": [{"text": prompt}]}],
@@ -94,10 +161,8 @@ class GeminiClient:
             }
             
             start = time.time()
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, timeout=60)
-                response.raise_for_status()
-                data = response.json()
+            response = await _post_with_retry(self._gen_url, headers=_JSON_HEADERS, content=_dumps(payload))
+            data = _loads(response.content)
             
             latency = time.time() - start
             
@@ -107,7 +172,7 @@ class GeminiClient:
                 "provider": "gemini",
                 "model": self.model,
                 "content": content,
-                "tokens_used": len(prompt.split()) + len(content.split()),  # Estimate
+                "tokens_used": _estimate_tokens(prompt) + _estimate_tokens(content),  # Estimate
                 "latency": latency,
                 "success": True
             }
@@ -120,24 +185,27 @@ class GPTClient:
     """OpenAI GPT API"""
     
     def __init__(self):
-        self.api_key = os.getenv("OPENAI_API_KEY")
+        self._api_key_env = "OPENAI_API_KEY"
+        self.api_key = None  # Resolved on first generate()
         self.model = "gpt-3.5-turbo"
         self.base_url = "https://api.openai.com/v1/chat/completions"
+        self._headers = None
     
     def is_configured(self) -> bool:
-        return bool(self.api_key)
+        return bool(os.environ.get(self._api_key_env))
     
     async def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7) -> Dict:
+        if not self.api_key:
+            self.api_key = os.environ.get(self._api_key_env)
         if not self.api_key:
             return {"error": "OPENAI_API_KEY not set", "provider": "gpt"}
         
         try:
-            import httpx
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            if self._headers is None:
+                self._headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                }
             
             payload = {
                 "model": self.model,
@@ -147,10 +215,8 @@ class GPTClient:
             }
             
             start = time.time()
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.base_url, headers=headers, json=payload, timeout=60)
-                response.raise_for_status()
-                data = response.json()
+            response = await _post_with_retry(self.base_url, headers=self._headers, content=_dumps(payload))
+            data = _loads(response.content)
             
             latency = time.time() - start
             
@@ -171,6 +237,23 @@ class GPTClient:
 # UNIFIED ORCHESTRATOR
 # =============================================================================
 
+class ProviderID(IntEnum):
+    CLAUDE = 0
+    GEMINI = 1
+    GPT = 2
+
+PROVIDER_NAMES = ("claude", "gemini", "gpt")  # Indexed by ProviderID
+
+
+@dataclass(slots=True)
+class ProviderStats:
+    """Per-provider counters, updated on every call"""
+    requests: int = 0
+    tokens: int = 0
+    successes: int = 0
+    cost: float = 0.0
+
+
 class AIOrchestrator:
     """
     Routes tasks to optimal AI provider based on weights and task type.
@@ -196,71 +279,73 @@ class AIOrchestrator:
             "precision": 0.6
         }
         
-        self.stats = {
-            "total_requests": 0,
-            "total_tokens": 0,
-            "total_cost": 0.0,
-            "by_provider": {
-                "claude": {"requests": 0, "tokens": 0, "successes": 0},
-                "gemini": {"requests": 0, "tokens": 0, "successes": 0},
-                "gpt": {"requests": 0, "tokens": 0, "successes": 0}
-            }
-        }
-        
         # Cost per 1K tokens (approximate)
         self.costs = {
             "claude": 0.003,
             "gemini": 0.00125,
             "gpt": 0.0005
         }
+        
+        # Hot-path views indexed by ProviderID
+        self._providers = (self.claude, self.gemini, self.gpt)
+        self._stats = tuple(ProviderStats() for _ in PROVIDER_NAMES)
+        self._cost_per_token = tuple(self.costs[name] / 1000 for name in PROVIDER_NAMES)
+        self.provider_stats = dict(zip(PROVIDER_NAMES, self._stats))
+        
+        self._build_route_table()
+        self.check_config()
     
     def check_config(self) -> Dict:
-        """Check which providers are configured"""
-        return {
-            "claude": self.claude.is_configured(),
-            "gemini": self.gemini.is_configured(),
-            "gpt": self.gpt.is_configured()
-        }
+        """Check which providers are configured (also refreshes the routing mask)"""
+        self._configured = tuple(p.is_configured() for p in self._providers)
+        return dict(zip(PROVIDER_NAMES, self._configured))
     
-    def route(self, task_type: str = "general", complexity: float = 0.5) -> str:
-        """Decide which provider to use"""
-        
-        scores = {"claude": 0, "gemini": 0, "gpt": 0}
+    def _build_route_table(self):
+        """Precompute (claude, gemini, gpt) task bonuses; rerun if weights change"""
+        table = {}
         
         # Quality-focused tasks → Claude
-        if task_type in ["strategy", "code", "reasoning", "complex", "personal"]:
-            scores["claude"] += self.weights["quality"] * 30
+        for task in ("strategy", "code", "reasoning", "complex", "personal"):
+            table[task] = (self.weights["quality"] * 30, 0.0, 0.0)
         
         # Research/long-form → Gemini
-        if task_type in ["research", "analysis", "long_form", "multimodal"]:
-            scores["gemini"] += self.weights["speed"] * 25
+        for task in ("research", "analysis", "long_form", "multimodal"):
+            table[task] = (0.0, self.weights["speed"] * 25, 0.0)
         
         # Bulk/simple → GPT
-        if task_type in ["bulk", "simple", "routine", "cheap"]:
-            scores["gpt"] += self.weights["cost"] * 35
+        for task in ("bulk", "simple", "routine", "cheap"):
+            table[task] = (0.0, 0.0, self.weights["cost"] * 35)
         
-        # Complexity adjustment
-        scores["claude"] += complexity * 20
-        scores["gpt"] += (1 - complexity) * 15
-        scores["gemini"] += 0.5 * 10  # Middle ground
+        self._task_bonus = table
+    
+    def route(self, task_type: str = "general", complexity: float = 0.5) -> str:
+        """Decide which provider to use"""
+        return PROVIDER_NAMES[self._route_id(task_type, complexity)]
+    
+    def _route_id(self, task_type: str, complexity: float) -> ProviderID:
+        claude, gemini, gpt = self._task_bonus.get(task_type, (0.0, 0.0, 0.0))
         
-        # Only consider configured providers
-        config = self.check_config()
-        for provider in list(scores.keys()):
-            if not config[provider]:
-                scores[provider] = -1000  # Effectively disable
+        # Complexity adjustment; unconfigured providers are effectively disabled.
+        # The mask is re-read each time (three env lookups) so keys set or
+        # removed after construction take effect without calling check_config()
+        claude_p, gemini_p, gpt_p = self._providers
+        configured = self._configured = (claude_p.is_configured(), gemini_p.is_configured(), gpt_p.is_configured())
+        scores = (
+            claude + complexity * 20 if configured[ProviderID.CLAUDE] else -1000,
+            gemini + 0.5 * 10 if configured[ProviderID.GEMINI] else -1000,  # Middle ground
+            gpt + (1 - complexity) * 15 if configured[ProviderID.GPT] else -1000,
+        )
         
-        # Return highest scoring
-        best = max(scores, key=scores.get)
-        return best
+        # Return highest scoring (first wins ties, as before)
+        return ProviderID(scores.index(max(scores)))
     
     async def generate(self, prompt: str, task_type: str = "general", 
                        complexity: float = 0.5, max_tokens: int = 1024) -> Dict:
         """Generate response using optimal provider"""
         
         # Route to best provider
-        provider_name = self.route(task_type, complexity)
-        provider = self.providers[provider_name]
+        pid = self._route_id(task_type, complexity)
+        provider = self._providers[pid]
         
         # Calculate temperature from creativity weight
         temperature = 0.3 + (self.weights["creativity"] * 0.7)  # 0.3 to 1.0
@@ -268,27 +353,74 @@ class AIOrchestrator:
         # Make the call
         result = await provider.generate(prompt, max_tokens, temperature)
         
-        # Track stats
-        self.stats["total_requests"] += 1
-        self.stats["by_provider"][provider_name]["requests"] += 1
+        return self._record(pid, result)
+    
+    async def generate_race(self, prompt: str, providers: Optional[List[str]] = None,
+                            max_tokens: int = 1024) -> Dict:
+        """Query providers concurrently, return the first successful response"""
+        
+        self.check_config()
+        ids = [
+            pid for pid in ProviderID
+            if self._configured[pid] and (providers is None or PROVIDER_NAMES[pid] in providers)
+        ]
+        if not ids:
+            return {"error": "No providers configured", "success": False}
+        
+        temperature = 0.3 + (self.weights["creativity"] * 0.7)
+        
+        pending = {
+            asyncio.create_task(self._providers[pid].generate(prompt, max_tokens, temperature)): pid
+            for pid in ids
+        }
+        
+        result = {}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = self._record(pending.pop(task), task.result())
+                    if result.get("success"):
+                        return result
+        finally:
+            # Cancel stragglers once a winner is in
+            for task in pending:
+                task.cancel()
+        
+        return result
+    
+    def _record(self, pid: ProviderID, result: Dict) -> Dict:
+        """Track stats for a completed provider call"""
+        ps = self._stats[pid]
+        ps.requests += 1
         
         if result.get("success"):
             tokens = result.get("tokens_used", 0)
-            cost = (tokens / 1000) * self.costs[provider_name]
+            cost = tokens * self._cost_per_token[pid]
             
-            self.stats["total_tokens"] += tokens
-            self.stats["total_cost"] += cost
-            self.stats["by_provider"][provider_name]["tokens"] += tokens
-            self.stats["by_provider"][provider_name]["successes"] += 1
+            ps.tokens += tokens
+            ps.cost += cost
+            ps.successes += 1
             
             result["cost"] = cost
         
         return result
     
+    async def aclose(self):
+        """Close the shared HTTP connection pool"""
+        global _SHARED_CLIENT
+        if _SHARED_CLIENT is not None:
+            await _SHARED_CLIENT.aclose()
+            _SHARED_CLIENT = None
+    
     def get_stats(self) -> Dict:
         """Get orchestrator statistics"""
+        by_provider = {name: asdict(ps) for name, ps in self.provider_stats.items()}
         return {
-            **self.stats,
+            "total_requests": sum(ps["requests"] for ps in by_provider.values()),
+            "total_tokens": sum(ps["tokens"] for ps in by_provider.values()),
+            "total_cost": sum(ps["cost"] for ps in by_provider.values()),
+            "by_provider": by_provider,
             "providers_configured": self.check_config(),
             "current_weights": self.weights
         }
@@ -364,6 +496,8 @@ async def demo():
     print(f"  Total Requests: {stats['total_requests']}")
     print(f"  Total Tokens: {stats['total_tokens']}")
     print(f"  Total Cost: ${stats['total_cost']:.6f}")
+    
+    await orch.aclose()
 
 
 if __name__ == "__main__":
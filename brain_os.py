@@ -1,16 +1,49 @@
-﻿import os, json, time, hashlib, secrets, hmac
-from datetime import datetime, timedelta
+﻿import os, re, time, atexit, base64, hashlib, secrets, hmac, queue, threading
+import orjson
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, List
-from collections import defaultdict
-from fastapi import FastAPI, HTTPException, Header, Request, BackgroundTasks
+from array import array
+from collections import OrderedDict, deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Header, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 import uvicorn
 
+# CLOCK - formatted timestamps are reused for the whole second
+@lru_cache(maxsize=8)
+def _fmt_time(sec, fmt=None):
+    dt = datetime.fromtimestamp(sec)
+    return dt.isoformat() if fmt is None else dt.strftime(fmt)
+
+def _now_str(fmt=None):
+    return _fmt_time(int(time.time()), fmt)
+
+def _first_match(patterns, ignore_case=False):
+    """Compile patterns into one linear scan returning the first hit or None"""
+    try:
+        import ahocorasick
+    except ImportError:
+        # Case folding happens inside the regex engine - no lowered copy of the text
+        regex = re.compile('|'.join(map(re.escape, patterns)), re.IGNORECASE if ignore_case else 0)
+        by_lower = {p.lower(): p for p in patterns}
+        def scan(text):
+            m = regex.search(text)
+            return by_lower.get(m.group().lower(), m.group()) if m else None
+        return scan
+    automaton = ahocorasick.Automaton()
+    for p in patterns:
+        automaton.add_word(p.lower() if ignore_case else p, p)
+    automaton.make_automaton()
+    def scan(text):
+        for _, p in automaton.iter(text.lower() if ignore_case else text):
+            return p
+        return None
+    return scan
+
 # PATTERN VALIDATOR - Layer 5
 class PatternValidator:
     def __init__(self):
@@ -20,21 +53,22 @@ class PatternValidator:
         ]
         self.max_length = 10000
         self.suspicious = ['<script>', '<?php', 'eval(', 'exec(']
+        self._find_blocked = _first_match(self.blocked, ignore_case=True)
+        self._find_suspicious = _first_match(self.suspicious)
     
     def validate(self, text):
         if len(text) > self.max_length:
             return False, f'Too long ({len(text)} > {self.max_length})'
-        if not text.strip():
+        if not text or text.isspace():
             return False, 'Empty pattern'
         
-        text_lower = text.lower()
-        for blocked in self.blocked:
-            if blocked in text_lower:
-                return False, f'Blocked phrase: {blocked}'
+        blocked = self._find_blocked(text)
+        if blocked:
+            return False, f'Blocked phrase: {blocked}'
         
-        for sus in self.suspicious:
-            if sus in text:
-                return False, f'Suspicious code: {sus}'
+        sus = self._find_suspicious(text)
+        if sus:
+            return False, f'Suspicious code: {sus}'
         
         return True, 'Valid'
     
@@ -50,29 +84,37 @@ class BackupSystem:
         self.last_backup = None
     
     def backup(self, data, name='grimoire'):
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'{name}_{ts}.json'
-        filepath = self.backup_dir / filename
-        filepath.write_text(json.dumps(data, indent=2))
+        return self.backup_with(lambda path: path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2)), name)
+    
+    def next_path(self, name='grimoire'):
+        return self.backup_dir / f'{name}_{_now_str("%Y%m%d_%H%M%S")}.json'
+    
+    def backup_with(self, write, name='grimoire', filepath=None):
+        """Like backup, but write(path) produces the file itself"""
+        filepath = Path(filepath) if filepath else self.next_path(name)
+        write(filepath)
         self.last_backup = filepath
         self._cleanup()
         return str(filepath)
     
     def _cleanup(self):
-        cutoff = datetime.now() - timedelta(days=self.retention)
-        for backup_file in self.backup_dir.glob('*.json'):
-            file_time = datetime.fromtimestamp(backup_file.stat().st_mtime)
-            if file_time < cutoff:
-                backup_file.unlink()
+        cutoff = time.time() - self.retention * 86400
+        with os.scandir(self.backup_dir) as it:
+            for e in it:
+                if e.name.endswith('.json') and e.stat().st_mtime < cutoff:
+                    os.unlink(e.path)
     
     def list_backups(self):
         backups = []
-        for f in sorted(self.backup_dir.glob('*.json'), reverse=True):
+        with os.scandir(self.backup_dir) as it:
+            entries = sorted((e for e in it if e.name.endswith('.json')), key=lambda e: e.name, reverse=True)
+        for e in entries:
+            st = e.stat()
             backups.append({
-                'name': f.name,
-                'path': str(f),
-                'size': f.stat().st_size,
-                'created': datetime.fromtimestamp(f.stat().st_mtime).isoformat()
+                'name': e.name,
+                'path': e.path,
+                'size': st.st_size,
+                'created': datetime.fromtimestamp(st.st_mtime).isoformat()
             })
         return backups
 
@@ -80,95 +122,267 @@ class BackupSystem:
 class Encryption:
     def __init__(self):
         try:
-            from cryptography.fernet import Fernet
-            self.Fernet = Fernet
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
             key_file = Path('encryption.key')
             if key_file.exists():
                 self.key = key_file.read_bytes()
             else:
-                self.key = Fernet.generate_key()
+                self.key = base64.urlsafe_b64encode(AESGCM.generate_key(bit_length=256))
                 key_file.write_bytes(self.key)
                 print(f'🔐 Encryption key generated: encryption.key')
-            self.cipher = Fernet(self.key)
+            # Key file holds 32 urlsafe-b64 bytes (same format Fernet used) -> AES-256-GCM
+            self.cipher = AESGCM(base64.urlsafe_b64decode(self.key))
             self.enabled = True
+            self.encrypt, self.decrypt = self._encrypt, self._decrypt
         except ImportError:
             print('⚠️  cryptography not installed - encryption disabled')
             self.enabled = False
+            self.encrypt = self.decrypt = lambda data: data
     
-    def encrypt(self, data):
-        if not self.enabled:
-            return data
-        return self.cipher.encrypt(data.encode()).decode()
+    def _encrypt(self, data):
+        nonce = os.urandom(12)
+        return base64.b64encode(nonce + self.cipher.encrypt(nonce, data.encode(), None)).decode()
     
-    def decrypt(self, encrypted):
-        if not self.enabled:
-            return encrypted
-        return self.cipher.decrypt(encrypted.encode()).decode()
+    def _decrypt(self, encrypted):
+        raw = base64.b64decode(encrypted)
+        return self.cipher.decrypt(raw[:12], raw[12:], None).decode()
 
 # RATE LIMITER - Layer 3
-limiter = Limiter(key_func=get_remote_address)
+class TokenBucketLimiter:
+    PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+    
+    def __init__(self, max_clients=10000):
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+    
+    def limit(self, spec):
+        """Dependency allowing e.g. '100/minute' per client IP, refilled continuously"""
+        take = self.meter(spec)
+        
+        def check(request: Request):
+            take(request.client.host)
+        
+        return Depends(check)
+    
+    def meter(self, spec):
+        """take(ip, n) charging n tokens per call, for endpoints whose cost varies per request"""
+        count, period = spec.split('/')
+        capacity = float(count)
+        rate = capacity / self.PERIODS[period]
+        buckets = OrderedDict()  # ip -> (tokens, last_seen), least recently seen first
+        
+        def take(ip, n=1):
+            now = time.monotonic()
+            with self._lock:
+                tokens, last = buckets.pop(ip, (capacity, now))  # re-inserted below, at the end
+                tokens = min(capacity, tokens + (now - last) * rate)
+                buckets[ip] = (tokens - n, now) if tokens >= n else (tokens, now)
+                # Idle clients would be back to a full bucket anyway; they sit at the front
+                full_since = now - capacity / rate
+                while len(buckets) > self.max_clients and next(iter(buckets.values()))[1] <= full_since:
+                    buckets.popitem(last=False)
+                if tokens < n:
+                    raise HTTPException(429, f'Rate limit exceeded: {spec}')
+        
+        return take
+
+limiter = TokenBucketLimiter()
 
 # AUDIT LOG - Layer 1
 class AuditLog:
-    def __init__(self):
+    def __init__(self, flush_interval=0.05, batch_size=256):
         self.log_dir = Path('audit_logs')
         self.log_dir.mkdir(exist_ok=True)
-        today = datetime.now().strftime('%Y%m%d')
-        self.log_file = self.log_dir / f'audit_{today}.jsonl'
+        self._fd = None
+        self._open(_now_str('%Y%m%d'))
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        # Tail of the log kept in memory so recent() never touches disk
+        self.ring = deque(self._read_tail(1024), maxlen=1024)
     
     def log(self, event, agent, action, result, meta=None):
         entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _now_str(),
             'event': event,
             'agent': agent,
             'action': action,
             'result': result,
             'metadata': meta or {}
         }
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        self.ring.append(entry)
+        if self._writer is None:
+            self._write([entry])
+        else:
+            self._queue.put_nowait(entry)
+    
+    def _open(self, today):
+        """Point the held-open append fd at the given day's file"""
+        if self._fd is not None:
+            os.close(self._fd)
+        self._date = today
+        self._minute = int(time.time() // 60)
+        self.log_file = self.log_dir / f'audit_{today}.jsonl'
+        self._fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    
+    def _write(self, entries):
+        # Check for a date rollover at most once a minute
+        minute = int(time.time() // 60)
+        if minute != self._minute:
+            self._minute = minute
+            today = _now_str('%Y%m%d')
+            if today != self._date:
+                self._open(today)
+        os.write(self._fd, b''.join(orjson.dumps(e, option=orjson.OPT_APPEND_NEWLINE) for e in entries))
+    
+    def start(self):
+        """Hand writes to a background flusher (app startup)"""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._flush_loop, name='audit-writer', daemon=True)
+            self._writer.start()
+    
+    def stop(self):
+        """Flush pending entries and go back to synchronous writes (app shutdown)"""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            self._write(pending)
+    
+    def _flush_loop(self):
+        # Block for the first entry, then gather a batch for up to flush_interval
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            done = batch[-1] is None
+            if done:
+                batch.pop()
+            if batch:
+                self._write(batch)
+            if done:
+                return
     
     def recent(self, limit=100):
+        if limit <= 0:
+            return []
+        if limit > self.ring.maxlen:
+            return self._read_tail(limit)
+        return list(self.ring)[-limit:]
+    
+    def _read_tail(self, limit):
         if not self.log_file.exists():
             return []
-        with open(self.log_file, 'r') as f:
-            lines = f.readlines()
-            return [json.loads(line) for line in lines[-limit:]]
+        with open(self.log_file, 'rb') as f:
+            # Read backwards from EOF, growing the window until it holds limit whole lines
+            size = f.seek(0, os.SEEK_END)
+            window = 64 * 1024
+            while True:
+                start = max(0, size - window)
+                f.seek(start)
+                lines = f.read().splitlines()
+                if start == 0 or len(lines) > limit:
+                    break
+                window *= 4
+        if start:
+            lines = lines[1:]
+        entries = []
+        for line in lines[-limit:]:
+            try:
+                entries.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue  # torn write or hand-edited line; don't let it block startup
+        return entries
 
 # COST TRACKER - Layer 2
 class CostTracker:
-    def __init__(self, daily_budget=10.0):
+    def __init__(self, daily_budget=10.0, flush_interval=2.0):
         self.daily_budget = daily_budget
-        self.costs = defaultdict(lambda: {'total': 0.0, 'requests': 0})
+        # provider -> [total, requests]; expanded to dicts only for reports and the file
+        self.costs = {'claude': [0.0, 0], 'gemini': [0.0, 0], 'gpt': [0.0, 0]}
         self.rates = {
             'claude': {'input': 0.003, 'output': 0.015},
             'gemini': {'input': 0.000125, 'output': 0.000375},
             'gpt': {'input': 0.0005, 'output': 0.0015}
         }
         self.cost_file = Path('costs.json')
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._stop = threading.Event()
+        self._flusher = None
         self._load()
     
     def _load(self):
         if self.cost_file.exists():
-            data = json.loads(self.cost_file.read_text())
-            today = datetime.now().strftime('%Y-%m-%d')
+            data = orjson.loads(self.cost_file.read_bytes())
+            today = _now_str('%Y-%m-%d')
             if today in data:
-                self.costs = defaultdict(lambda: {'total': 0.0, 'requests': 0}, data[today])
+                for provider, c in data[today].items():
+                    self.costs[provider] = [c['total'], c['requests']]
     
     def _save(self):
-        today = datetime.now().strftime('%Y-%m-%d')
-        self.cost_file.write_text(json.dumps({today: dict(self.costs)}, indent=2))
+        today = _now_str('%Y-%m-%d')
+        tmp = self.cost_file.with_suffix('.json.tmp')
+        tmp.write_bytes(orjson.dumps({today: self.by_provider()}, option=orjson.OPT_INDENT_2))
+        os.replace(tmp, self.cost_file)
+    
+    def flush(self):
+        if self._dirty:
+            self._dirty = False
+            self._save()
+    
+    def start(self):
+        """Debounce saves to one write per flush_interval (app startup)"""
+        if self._flusher is None:
+            self._stop.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name='cost-writer', daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
+    
+    def stop(self):
+        """Stop the flusher and persist anything outstanding (app shutdown)"""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+    
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
     
     def record(self, provider, input_tokens, output_tokens):
         rates = self.rates.get(provider, {'input': 0, 'output': 0})
         cost = (input_tokens / 1000 * rates['input']) + (output_tokens / 1000 * rates['output'])
-        self.costs[provider]['total'] += cost
-        self.costs[provider]['requests'] += 1
-        self._save()
+        c = self.costs.get(provider)
+        if c is None:
+            c = self.costs[provider] = [0.0, 0]
+        c[0] += cost
+        c[1] += 1
+        if self._flusher is None:
+            self._save()
+        else:
+            self._dirty = True
         return cost
     
     def today_total(self):
-        return sum(p['total'] for p in self.costs.values())
+        return sum(p[0] for p in self.costs.values())
+    
+    def by_provider(self):
+        return {k: {'total': t, 'requests': n} for k, (t, n) in self.costs.items()}
     
     def check_budget(self):
         total = self.today_total()
@@ -190,13 +404,14 @@ class CostTracker:
             'remaining': remaining,
             'percent_used': percent,
             'status': status,
-            'by_provider': dict(self.costs)
+            'by_provider': self.by_provider()
         }
 
 # GATE
 class Gate:
     def __init__(self, master_key, audit):
         self.master_key = master_key
+        self._key_bytes = master_key.encode()
         self.agent_keys = {}
         self.blocked_ips = set()
         self.audit = audit
@@ -204,7 +419,7 @@ class Gate:
     def create_token(self, name):
         ts = int(time.time())
         payload = f'{name}:{ts}'
-        token = hmac.new(self.master_key.encode(), payload.encode(), hashlib.sha256).hexdigest()
+        token = hmac.digest(self._key_bytes, payload.encode(), 'sha256').hex()
         full_token = f'{name}:{ts}:{token}'
         self.agent_keys[name] = {'token': full_token, 'created': ts}
         self.audit.log('AGENT_REGISTER', name, 'register', 'SUCCESS')
@@ -218,11 +433,17 @@ class Gate:
             self.audit.log('AUTH_FAILED', 'unknown', 'verify', 'NO_AUTH', {'ip': ip})
             return False, 'NO_AUTH'
         try:
-            parts = auth.replace('Bearer ', '').split(':')
+            presented = auth.replace('Bearer ', '')
+            parts = presented.split(':')
             name, ts, token = parts[0], parts[1], parts[2]
-            payload = f'{name}:{ts}'
-            expected = hmac.new(self.master_key.encode(), payload.encode(), hashlib.sha256).hexdigest()
-            if hmac.compare_digest(token, expected):
+            stored = self.agent_keys.get(name)
+            # The agent's latest token skips the HMAC; any other token (issued before a
+            # re-register or a restart) is still accepted if its signature is valid
+            valid = stored is not None and hmac.compare_digest(stored['token'].encode(), presented.encode())
+            if not valid:
+                expected = hmac.digest(self._key_bytes, f'{name}:{ts}'.encode(), 'sha256').hex()
+                valid = hmac.compare_digest(token, expected)
+            if valid:
                 self.audit.log('AUTH_SUCCESS', name, 'verify', 'SUCCESS', {'ip': ip})
                 return True, name
             self.audit.log('AUTH_FAILED', name, 'verify', 'INVALID_TOKEN', {'ip': ip})
@@ -232,9 +453,27 @@ class Gate:
             return False, 'INVALID'
 
 # GRIMOIRE
+try:
+    from blake3 import blake3
+    def _pattern_id(data):
+        return blake3(data).hexdigest(length=6)
+except ImportError:
+    def _pattern_id(data):
+        # hashlib's SHA-256 dispatches to SHA-NI where the CPU has it
+        return hashlib.sha256(data).digest()[:6].hex()
+
+_TOKEN_RE = re.compile(r'\S+')
+_STOPWORDS = frozenset({'the','a','an','is','are','was','to','of','and','in','for','on','with','this','that'})
+
 class Grimoire:
     def __init__(self, audit, encryption, validator):
-        self.patterns = {}
+        # Column store: row i of each column belongs to the pattern with pid_to_idx[pid] == i
+        self.pid_to_idx = {}
+        self.orig = []
+        self.comp = []
+        self.created = array('d')
+        self.uses = array('I')
+        self._lock = threading.Lock()
         self.stats = {'total': 0, 'hits': 0, 'saved': 0, 'rejected': 0}
         self.audit = audit
         self.encryption = encryption
@@ -253,25 +492,40 @@ class Grimoire:
         # Sanitize
         text = self.validator.sanitize(text)
         
-        pid = hashlib.md5(text.encode()).hexdigest()[:12]
+        pid = _pattern_id(text.encode())
         
-        if pid in self.patterns:
+        idx = self.pid_to_idx.get(pid)
+        if idx is not None:
             self.stats['hits'] += 1
-            self.patterns[pid]['uses'] += 1
+            self.uses[idx] += 1
             self.audit.log('COMPRESS_HIT', agent, 'compress', 'CACHE_HIT', {'pattern_id': pid})
-            comp = self.encryption.decrypt(self.patterns[pid]['comp']) if self.encryption.enabled else self.patterns[pid]['comp']
+            comp = self.encryption.decrypt(self.comp[idx])
             return {'compressed': comp, 'cache_hit': True, 'pattern_id': pid, 'encrypted': self.encryption.enabled}
         
-        words = text.lower().split()
-        stops = {'the','a','an','is','are','was','to','of','and','in','for','on','with','this','that'}
-        comp = ' '.join([w[:4] if len(w)>4 else w for w in words if w not in stops][:15])
-        
-        tokens_before = len(words)
-        tokens_after = len(comp.split())
+        # One pass: lower only the words we look at, stop building at 15 kept, just count the rest
+        tokens = _TOKEN_RE.finditer(text)
+        parts = []
+        tokens_before = 0
+        for m in tokens:
+            tokens_before += 1
+            w = m.group().lower()
+            if w not in _STOPWORDS:
+                parts.append(w[:4])
+                if len(parts) == 15:
+                    break
+        tokens_before += sum(1 for _ in tokens)
+        comp = ' '.join(parts)
+        tokens_after = len(parts)
         
         if learn:
-            encrypted_comp = self.encryption.encrypt(comp) if self.encryption.enabled else comp
-            self.patterns[pid] = {'orig': text, 'comp': encrypted_comp, 'created': time.time(), 'uses': 1}
+            encrypted_comp = self.encryption.encrypt(comp)
+            with self._lock:
+                if pid not in self.pid_to_idx:
+                    self.orig.append(text)
+                    self.comp.append(encrypted_comp)
+                    self.created.append(time.time())
+                    self.uses.append(1)
+                    self.pid_to_idx[pid] = len(self.orig) - 1
             self.stats['saved'] += tokens_before - tokens_after
             self.audit.log('PATTERN_LEARNED', agent, 'compress', 'NEW_PATTERN', {'pattern_id': pid, 'encrypted': self.encryption.enabled})
         
@@ -285,12 +539,31 @@ class Grimoire:
             'encrypted': self.encryption.enabled
         }
     
+    def __len__(self):
+        return len(self.pid_to_idx)
+    
+    def dump_to(self, path):
+        """Serialize the columns as-is, skipping the per-pattern dicts export() builds"""
+        with self._lock:
+            data = orjson.dumps({
+                'pattern_ids': list(self.pid_to_idx),
+                'orig': self.orig,
+                'comp': self.comp,
+                'created': self.created.tolist(),
+                'uses': self.uses.tolist(),
+                'stats': self.stats,
+                'encrypted': self.encryption.enabled,
+                'exported_at': _now_str()
+            })
+        Path(path).write_bytes(data)
+    
     def export(self):
         return {
-            'patterns': self.patterns,
+            'patterns': {pid: {'orig': self.orig[i], 'comp': self.comp[i], 'created': self.created[i], 'uses': self.uses[i]}
+                         for pid, i in self.pid_to_idx.items()},
             'stats': self.stats,
             'encrypted': self.encryption.enabled,
-            'exported_at': datetime.now().isoformat()
+            'exported_at': _now_str()
         }
 
 # ROUTER
@@ -317,6 +590,7 @@ class Brain:
         self.gate = Gate(self.master_key, self.audit)
         self.grimoire = Grimoire(self.audit, self.encryption, self.validator)
         self.router = Router()
+        self._backup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='backup')
         self.agents = {}
         self.cycles = 0
         self.perf = 1.0
@@ -337,28 +611,52 @@ class Brain:
         self.cycles += 1
         self.audit.log('COMPOUND_CYCLE', agent, 'compound', 'SUCCESS', {'cycle': self.cycles, 'perf': self.perf})
         
-        # Auto-backup every 10 cycles
+        # Auto-backup every 10 cycles, off the request thread
         if self.cycles % 10 == 0:
-            self.auto_backup(agent)
+            self.schedule_backup(agent)
         
         return self.perf
     
-    def auto_backup(self, agent):
-        data = self.grimoire.export()
-        filepath = self.backup.backup(data)
+    def auto_backup(self, agent, filepath=None):
+        filepath = self.backup.backup_with(self.grimoire.dump_to, filepath=filepath)
         self.audit.log('AUTO_BACKUP', agent, 'backup', 'SUCCESS', {'file': filepath})
         return filepath
+    
+    def schedule_backup(self, agent):
+        """Queue a backup on the backup thread; returns the path it will be written to"""
+        filepath = str(self.backup.next_path())
+        future = self._backup_pool.submit(self.auto_backup, agent, filepath)
+        
+        def audit_failure(f):
+            exc = f.exception()
+            if exc:
+                self.audit.log('AUTO_BACKUP', agent, 'backup', 'FAILED', {'file': filepath, 'error': str(exc)})
+        
+        future.add_done_callback(audit_failure)
+        return filepath
 
 # API
-app = FastAPI(title='Brain OS - FORTRESS COMPLETE')
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app = FastAPI(title='Brain OS - FORTRESS COMPLETE', default_response_class=ORJSONResponse)
 app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
 brain = Brain()
 
+@app.on_event('startup')
+def start_background_writers():
+    brain.audit.start()
+    brain.costs.start()
+
+@app.on_event('shutdown')
+def stop_background_writers():
+    brain._backup_pool.shutdown(wait=True)
+    brain.audit.stop()
+    brain.costs.stop()
+
 class Req(BaseModel):
     text: str
 
+class BatchReq(BaseModel):
+    texts: List[str]
+
 class Reg(BaseModel):
     agent_name: str
     master_key: str
@@ -370,7 +668,7 @@ def root():
         'name': 'Brain OS - FORTRESS COMPLETE',
         'status': 'ONLINE',
         'cycles': brain.cycles,
-        'patterns': len(brain.grimoire.patterns),
+        'patterns': len(brain.grimoire),
         'budget_status': budget['status'],
         'spent_today': f'${budget["spent"]:.4f}',
         'security': {
@@ -385,15 +683,19 @@ def root():
         'fortress_layers': 6
     }
 
-@app.post('/register')
-@limiter.limit('5/minute')
+@app.post('/register', dependencies=[limiter.limit('5/minute')])
 def register(r: Reg, request: Request):
     if r.master_key != brain.master_key:
         raise HTTPException(403, 'Invalid key')
     return {'agent': r.agent_name, 'token': brain.register(r.agent_name)}
 
-@app.post('/compress')
-@limiter.limit('100/minute')
+# One per-IP text budget for /compress (1 per call) and /compress_batch (1 per text)
+text_quota = limiter.meter('100/minute')
+
+def _charge_one_text(request: Request):
+    text_quota(request.client.host)
+
+@app.post('/compress', dependencies=[Depends(_charge_one_text)])
 def compress(r: Req, request: Request, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
@@ -410,8 +712,34 @@ def compress(r: Req, request: Request, authorization: str = Header(None)):
     except ValueError as e:
         raise HTTPException(400, str(e))
 
-@app.get('/stats')
-@limiter.limit('30/minute')
+MAX_BATCH = 50
+
+@app.post('/compress_batch')
+def compress_batch(r: BatchReq, request: Request, authorization: str = Header(None)):
+    """Up to MAX_BATCH texts per call, each counted against the 100/minute text quota"""
+    ip = request.client.host
+    if len(r.texts) > MAX_BATCH:
+        raise HTTPException(400, f'Batch too large ({len(r.texts)} > {MAX_BATCH})')
+    text_quota(ip, max(len(r.texts), 1))
+    ok, agent = brain.gate.verify(authorization, ip)
+    if not ok:
+        raise HTTPException(403, f'Denied: {agent}')
+    
+    provider = brain.router.route('general', 0.5)
+    results = []
+    for text in r.texts:
+        try:
+            result = brain.grimoire.compress(text, agent)
+        except ValueError as e:
+            results.append({'error': str(e)})
+            continue
+        cost = brain.costs.record(provider, result.get('tokens_before', 0), result.get('tokens_after', 0))
+        result['cost'] = f'${cost:.6f}'
+        result['provider'] = provider
+        results.append(result)
+    return {'results': results, 'count': len(results)}
+
+@app.get('/stats', dependencies=[limiter.limit('30/minute')])
 def stats(request: Request, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
@@ -421,15 +749,14 @@ def stats(request: Request, authorization: str = Header(None)):
         'performance': f'{brain.perf:.4f}x',
         'cycles': brain.cycles,
         'grimoire': brain.grimoire.stats,
-        'patterns': len(brain.grimoire.patterns),
+        'patterns': len(brain.grimoire),
         'agents': list(brain.agents.keys()),
         'budget': brain.costs.check_budget(),
         'encryption_enabled': brain.encryption.enabled,
         'last_backup': str(brain.backup.last_backup) if brain.backup.last_backup else None
     }
 
-@app.post('/compound')
-@limiter.limit('10/minute')
+@app.post('/compound', dependencies=[limiter.limit('10/minute')])
 def compound(request: Request, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
@@ -437,17 +764,16 @@ def compound(request: Request, authorization: str = Header(None)):
         raise HTTPException(403, 'Denied')
     return {'cycle': brain.cycles, 'performance': f'{brain.compound(agent):.4f}x'}
 
-@app.get('/audit')
-@limiter.limit('20/minute')
+@app.get('/audit', dependencies=[limiter.limit('20/minute')])
 def get_audit(request: Request, limit: int = 100, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
     if not ok:
         raise HTTPException(403, 'Denied')
-    return {'logs': brain.audit.recent(limit), 'count': len(brain.audit.recent(limit))}
+    logs = brain.audit.recent(limit)
+    return {'logs': logs, 'count': len(logs)}
 
-@app.get('/costs')
-@limiter.limit('30/minute')
+@app.get('/costs', dependencies=[limiter.limit('30/minute')])
 def get_costs(request: Request, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
@@ -455,18 +781,17 @@ def get_costs(request: Request, authorization: str = Header(None)):
         raise HTTPException(403, 'Denied')
     return brain.costs.check_budget()
 
-@app.post('/backup')
-@limiter.limit('5/minute')
+@app.post('/backup', dependencies=[limiter.limit('5/minute')])
 def manual_backup(request: Request, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
     if not ok:
         raise HTTPException(403, 'Denied')
-    filepath = brain.auto_backup(agent)
-    return {'backup_created': filepath, 'encrypted': brain.encryption.enabled}
+    # Written on the backup thread; failures land in the audit log
+    filepath = brain.schedule_backup(agent)
+    return {'backup_created': filepath, 'backup': 'SCHEDULED', 'encrypted': brain.encryption.enabled}
 
-@app.get('/backups')
-@limiter.limit('10/minute')
+@app.get('/backups', dependencies=[limiter.limit('10/minute')])
 def list_backups(request: Request, authorization: str = Header(None)):
     ip = request.client.host
     ok, agent = brain.gate.verify(authorization, ip)
@@ -497,4 +822,8 @@ if __name__ == '__main__':
     print('📝 ./audit_logs/')
     print('💰 ./costs.json')
     print('💾 ./backups/\n')
-    uvicorn.run(app, host='0.0.0.0', port=3000)
+    # loop/http 'auto' pick uvloop + httptools when installed. Brain state (master key, grimoire,
+    # costs) lives per process, so BRAIN_WORKERS > 1 only suits stateless/sticky deployments.
+    workers = int(os.environ.get('BRAIN_WORKERS', '1'))
+    uvicorn.run('brain_os:app' if workers > 1 else app, host='0.0.0.0', port=3000,
+                loop='auto', http='auto', workers=workers)
@@ -3,13 +3,25 @@
 EKOSYSTEM BUILDER - COMPLETE SYSTEM
 Single file deployment - Love • Loyalty • Honor • Everybody Eats
 """
+import array
 import asyncio
+import functools
 import json
+import logging
+import sys
 from datetime import datetime
 from typing import Dict, List, Any
 from dataclasses import dataclass
 from enum import Enum
 import uuid
+from collections import Counter, defaultdict
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+log = logging.getLogger("ekosystem")
 
 # === ENUMS ===
 class BuildPhase(Enum):
@@ -27,8 +39,41 @@ class BuildChannel(Enum):
     ORB_AI = "orb_ai"          # B2C - empower humanity
     HYBRID = "hybrid"
 
+# Tournament approaches, assigned round-robin to agents, and their fixed scores
+APPROACHES = ("cost_optimized", "speed_optimized", "quality_optimized", "viral_optimized")
+APPROACH_SCORES = (0.72, 0.74, 0.73, 0.76)
+
+# Voice keywords; verticals are checked in priority order
+VERTICAL_KEYWORDS = (("elder", "elder_care"), ("voice", "voice_ai"), ("game", "gaming"),
+                     ("video", "content"), ("school", "education"), ("legal", "legal_tech"),
+                     ("health", "health_wellness"), ("enterprise", "enterprise_saas"))
+B2B_KEYWORDS = ("enterprise", "corporate", "b2b", "agency", "firm", "extract", "eko")
+B2C_KEYWORDS = ("game", "video", "school", "playground", "consumer", "orb", "play", "learn")
+
+def _keyword_automaton():
+    """One Aho-Corasick automaton over every keyword, or None without pyahocorasick"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in {kw for kw, _ in VERTICAL_KEYWORDS} | set(B2B_KEYWORDS) | set(B2C_KEYWORDS):
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AC = _keyword_automaton()
+
+@functools.lru_cache(maxsize=32)
+def _tournament_champion(num_agents):
+    """(agent, score) the bracket crowns; pure in num_agents, so memoized"""
+    # Scores are fixed per approach and ties go to the left slot, so the bracket
+    # always crowns the first agent holding the best approach
+    if num_agents > 1:
+        agent = max(range(min(num_agents, len(APPROACHES))), key=APPROACH_SCORES.__getitem__)
+        return agent, APPROACH_SCORES[agent]
+    return 0, 0
+
 # === DATA CLASSES ===
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BuildIntent:
     id: str
     voice_input: str
@@ -39,7 +84,7 @@ class BuildIntent:
     channel: BuildChannel = BuildChannel.HYBRID
     everybody_eats_split: float = 0.33
 
-@dataclass
+@dataclass(slots=True)
 class BuildCycle:
     id: str
     intent: BuildIntent
@@ -52,31 +97,48 @@ class BuildCycle:
 
 # === SHIELD PROTECTION ===
 class Shield:
+    __slots__ = ("max_daily_cost", "daily_spend", "_build_cb", "_test_cb", "_replicate_cb", "threat_level")
+    
     def __init__(self):
         self.max_daily_cost = 100.0
         self.daily_spend = 0.0
-        self.circuit_breakers = {"build": True, "test": True, "replicate": True}
+        self._build_cb = self._test_cb = self._replicate_cb = True
         self.threat_level = "GREEN"
     
+    @property
+    def circuit_breakers(self):
+        return {"build": self._build_cb, "test": self._test_cb, "replicate": self._replicate_cb}
+    
     def check_permission(self, action):
         if self.daily_spend > self.max_daily_cost:
             self.threat_level = "RED"
-            self.circuit_breakers[action] = False
+            if action == "build":
+                self._build_cb = False
+            elif action == "test":
+                self._test_cb = False
+            elif action == "replicate":
+                self._replicate_cb = False
             return False
-        return self.circuit_breakers.get(action, True)
+        if action == "build":
+            return self._build_cb
+        if action == "test":
+            return self._test_cb
+        if action == "replicate":
+            return self._replicate_cb
+        return True
     
     def track_cost(self, amount):
         self.daily_spend += amount
         if self.daily_spend > self.max_daily_cost * 0.9:
             self.threat_level = "ORANGE"
-            print(f"⚠️ SHIELD: Cost at {self.daily_spend/self.max_daily_cost:.0%} of daily limit")
+            log.warning("⚠️ SHIELD: Cost at %.0f%% of daily limit", self.daily_spend / self.max_daily_cost * 100)
 
 # === ORCHESTRATOR (THE BRAIN) ===
 class EkosystemOrchestrator:
     def __init__(self):
         self.active_builds = {}
         self.completed_builds = []
-        self.pattern_library = {}
+        self.pattern_library: Dict[str, Counter] = defaultdict(Counter)  # vertical -> learning counts
         self.shield = Shield()
         self.daily_improvement_rate = 0.01
         self.current_performance = 1.0
@@ -85,11 +147,14 @@ class EkosystemOrchestrator:
         self.total_revenue = 0.0
         self.eko_vision_revenue = 0.0
         self.orb_ai_revenue = 0.0
+        # Per-build metric columns for rollups; completed builds append satisfaction
+        # (revenue rollups are the running totals above, so they need no columns)
+        self._metrics_soa = {"user_satisfaction": array.array('d')}
     
-    async def receive_intent(self, voice_input: str) -> BuildIntent:
+    def receive_intent(self, voice_input: str) -> BuildIntent:
         intent_id = str(uuid.uuid4())[:8]
-        parsed = self._parse_voice(voice_input)
-        channel = self._detect_channel(voice_input)
+        vertical, channel = self._analyze(voice_input)
+        parsed = {"vertical": vertical, "raw": voice_input}
         
         # Everybody Eats split based on channel
         if channel == BuildChannel.EKO_VISION:
@@ -108,72 +173,54 @@ class EkosystemOrchestrator:
         )
         
         channel_text = "EXTRACT FROM ELITE" if channel == BuildChannel.EKO_VISION else "EMPOWER HUMANITY"
-        print(f"🎯 Intent: {intent_id}")
-        print(f"   Channel: {channel.value} ({channel_text})")
-        print(f"   Vertical: {intent.target_vertical}")
-        print(f"   Everybody Eats: {eats_split:.0%} to community")
+        log.info("🎯 Intent: %s", intent_id)
+        log.info("   Channel: %s (%s)", channel.value, channel_text)
+        log.info("   Vertical: %s", intent.target_vertical)
+        log.info("   Everybody Eats: %.0f%% to community", eats_split * 100)
         return intent
     
-    def _parse_voice(self, voice: str) -> Dict:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _analyze(voice: str):
+        """(vertical, channel) for an input, from one keyword scan; memoized per input"""
         v = voice.lower()
-        verticals = {"elder": "elder_care", "voice": "voice_ai", "game": "gaming",
-                     "video": "content", "school": "education", "legal": "legal_tech",
-                     "health": "health_wellness", "enterprise": "enterprise_saas"}
-        vertical = "general"
-        for kw, vert in verticals.items():
-            if kw in v:
-                vertical = vert
-                break
-        return {"vertical": vertical, "raw": voice}
-    
-    def _detect_channel(self, voice: str) -> BuildChannel:
-        v = voice.lower()
-        b2b = ["enterprise", "corporate", "b2b", "agency", "firm", "extract", "eko"]
-        b2c = ["game", "video", "school", "playground", "consumer", "orb", "play", "learn"]
+        # Keywords present anywhere in v (overlaps included, e.g. "play" in "playground")
+        hits = {kw for _, kw in _KEYWORD_AC.iter(v)} if _KEYWORD_AC is not None else v
         
-        b2b_score = sum(1 for kw in b2b if kw in v)
-        b2c_score = sum(1 for kw in b2c if kw in v)
+        vertical = next((vert for kw, vert in VERTICAL_KEYWORDS if kw in hits), "general")
+        b2b_score = sum(1 for kw in B2B_KEYWORDS if kw in hits)
+        b2c_score = sum(1 for kw in B2C_KEYWORDS if kw in hits)
         
         if b2b_score > b2c_score + 1:
-            return BuildChannel.EKO_VISION
+            channel = BuildChannel.EKO_VISION
         elif b2c_score > b2b_score + 1:
-            return BuildChannel.ORB_AI
-        return BuildChannel.HYBRID
+            channel = BuildChannel.ORB_AI
+        else:
+            channel = BuildChannel.HYBRID
+        return vertical, channel
     
-    async def run_tournament(self, num_agents=100) -> Dict:
-        print(f"⚔️ Tournament: {num_agents} agents competing")
-        proposals = []
-        approaches = ["cost_optimized", "speed_optimized", "quality_optimized", "viral_optimized"]
-        
-        for i in range(num_agents):
-            approach = approaches[i % 4]
-            proposals.append({"agent": i, "approach": approach, "score": 0})
+    def _parse_voice(self, voice: str) -> Dict:
+        return {"vertical": self._analyze(voice)[0], "raw": voice}
+    
+    def _detect_channel(self, voice: str) -> BuildChannel:
+        return self._analyze(voice)[1]
+    
+    def run_tournament(self, num_agents=100, verbose=True) -> Dict:
+        log.info("⚔️ Tournament: %d agents competing", num_agents)
+        if verbose and log.isEnabledFor(logging.INFO):
+            remaining, round_num = num_agents, 1
+            while remaining > 1:
+                log.info("   Round %d: %d proposals", round_num, remaining)
+                remaining, round_num = (remaining + 1) // 2, round_num + 1
         
-        # Tournament brackets
-        remaining = proposals
-        round_num = 1
-        while len(remaining) > 1:
-            print(f"   Round {round_num}: {len(remaining)} proposals")
-            winners = []
-            for i in range(0, len(remaining), 2):
-                if i + 1 < len(remaining):
-                    # Score based on approach
-                    scores = {"cost_optimized": 0.72, "speed_optimized": 0.74,
-                              "quality_optimized": 0.73, "viral_optimized": 0.76}
-                    remaining[i]["score"] = scores[remaining[i]["approach"]]
-                    remaining[i+1]["score"] = scores[remaining[i+1]["approach"]]
-                    winner = remaining[i] if remaining[i]["score"] >= remaining[i+1]["score"] else remaining[i+1]
-                    winners.append(winner)
-                else:
-                    winners.append(remaining[i])
-            remaining = winners
-            round_num += 1
+        agent, score = _tournament_champion(num_agents)
+        champion = {"agent": agent, "approach": APPROACHES[agent], "score": score}
         
-        print(f"🏆 Champion: {remaining[0]['approach']} (score: {remaining[0]['score']:.2f})")
-        return remaining[0]
+        log.info("🏆 Champion: %s (score: %.2f)", champion["approach"], champion["score"])
+        return champion
     
-    async def execute_build(self, cycle: BuildCycle, proposal: Dict):
-        print(f"🔨 Building with {proposal['approach']} approach")
+    def execute_build(self, cycle: BuildCycle, proposal: Dict):
+        log.info("🔨 Building with %s approach", proposal["approach"])
         cycle.phase = BuildPhase.BUILD
         
         # Generate modules based on channel
@@ -186,10 +233,10 @@ class EkosystemOrchestrator:
             modules.extend(["user_playground", "learning_engine", "creator_tools"])
         
         cycle.artifacts = {"modules": modules, "architecture": proposal["approach"]}
-        print(f"   Generated {len(modules)} modules")
+        log.info("   Generated %d modules", len(modules))
     
-    async def test_in_market(self, cycle: BuildCycle):
-        print(f"🧪 Testing {cycle.id} in live market")
+    def test_in_market(self, cycle: BuildCycle):
+        log.info("🧪 Testing %s in live market", cycle.id)
         cycle.phase = BuildPhase.TEST
         cycle.metrics = {
             "conversion_rate": 0.048,
@@ -197,11 +244,11 @@ class EkosystemOrchestrator:
             "cost_efficiency": 0.85,
             "viral_coefficient": 0.8
         }
-        print(f"   Conversion: {cycle.metrics['conversion_rate']:.1%}")
-        print(f"   Satisfaction: {cycle.metrics['user_satisfaction']:.0%}")
+        log.info("   Conversion: %.1f%%", cycle.metrics["conversion_rate"] * 100)
+        log.info("   Satisfaction: %.0f%%", cycle.metrics["user_satisfaction"] * 100)
     
-    async def refine_build(self, cycle: BuildCycle):
-        print(f"🔧 Refining {cycle.id}")
+    def refine_build(self, cycle: BuildCycle):
+        log.info("🔧 Refining %s", cycle.id)
         cycle.phase = BuildPhase.REFINE
         cycle.learnings = [
             "Improve value proposition clarity",
@@ -209,88 +256,85 @@ class EkosystemOrchestrator:
             "Add referral incentive",
             f"Pattern: {cycle.intent.target_vertical} responds to multi_agent"
         ]
-        print(f"   Extracted {len(cycle.learnings)} learnings")
+        log.info("   Extracted %d learnings", len(cycle.learnings))
         
         # Store learnings
         vert = cycle.intent.target_vertical
-        if vert not in self.pattern_library:
-            self.pattern_library[vert] = {"learnings": []}
-        self.pattern_library[vert]["learnings"].extend(cycle.learnings)
+        self.pattern_library[vert].update(map(sys.intern, cycle.learnings))
     
-    async def automate_cycle(self, cycle: BuildCycle):
-        print(f"🤖 Automating {cycle.id}")
+    def automate_cycle(self, cycle: BuildCycle):
+        log.info("🤖 Automating %s", cycle.id)
         cycle.phase = BuildPhase.AUTOMATE
-        print("   Automated 4 actions")
+        log.info("   Automated 4 actions")
     
-    async def evaluate_spawn(self, cycle: BuildCycle) -> float:
+    def evaluate_spawn(self, cycle: BuildCycle) -> float:
         score = 0.0
         if cycle.metrics.get("conversion_rate", 0) > 0.05: score += 0.3
         if cycle.metrics.get("user_satisfaction", 0) > 0.85: score += 0.3
         if cycle.metrics.get("cost_efficiency", 0) > 0.9: score += 0.2
         if cycle.metrics.get("viral_coefficient", 0) > 1.0: score += 0.2
         cycle.spawn_potential = score
-        print(f"📊 Spawn potential: {score:.0%}")
+        log.info("📊 Spawn potential: %.0f%%", score * 100)
         return score
     
-    async def process_revenue(self, cycle: BuildCycle, amount: float):
+    def process_revenue(self, cycle: BuildCycle, amount: float):
         community_share = amount * cycle.intent.everybody_eats_split
         self.community_pool += community_share
         self.total_revenue += amount
         
         if cycle.intent.channel == BuildChannel.EKO_VISION:
             self.eko_vision_revenue += amount
-            print(f"💰 B2B EXTRACTION: ${amount:,.2f} (${community_share:,.2f} → community)")
+            log.info("💰 B2B EXTRACTION: $%s ($%s → community)", f"{amount:,.2f}", f"{community_share:,.2f}")
         else:
             self.orb_ai_revenue += amount
-            print(f"🎮 B2C EMPOWERMENT: ${amount:,.2f} (${community_share:,.2f} → community)")
+            log.info("🎮 B2C EMPOWERMENT: $%s ($%s → community)", f"{amount:,.2f}", f"{community_share:,.2f}")
         
         cycle.community_value_created += community_share
         self.shield.track_cost(amount * 0.1)  # Track 10% as operating cost
     
-    async def run_full_cycle(self, voice_input: str) -> BuildCycle:
-        print("\n" + "="*60)
-        print("EKOSYSTEM BUILDER - FULL CYCLE")
-        print("="*60 + "\n")
+    def run_full_cycle(self, voice_input: str) -> BuildCycle:
+        log.info("\n%s\nEKOSYSTEM BUILDER - FULL CYCLE\n%s\n", "="*60, "="*60)
         
         # 1. Intent
-        intent = await self.receive_intent(voice_input)
+        intent = self.receive_intent(voice_input)
         
         # 2. Spawn cycle
         cycle = BuildCycle(id=f"BUILD-{intent.id}", intent=intent,
                           phase=BuildPhase.ANALYZE, artifacts={}, metrics={},
                           learnings=[], spawn_potential=0.0)
         self.active_builds[cycle.id] = cycle
-        print(f"🚀 Cycle spawned: {cycle.id}")
+        log.info("🚀 Cycle spawned: %s", cycle.id)
         
         # 3. Tournament
-        winner = await self.run_tournament()
+        winner = self.run_tournament()
         
         # 4. Build
-        await self.execute_build(cycle, winner)
+        self.execute_build(cycle, winner)
         
         # 5. Test
-        await self.test_in_market(cycle)
+        self.test_in_market(cycle)
         
         # 6. Refine
-        await self.refine_build(cycle)
+        self.refine_build(cycle)
         
         # 7. Automate
-        await self.automate_cycle(cycle)
+        self.automate_cycle(cycle)
         
         # 8. Evaluate spawn
-        spawn_score = await self.evaluate_spawn(cycle)
+        spawn_score = self.evaluate_spawn(cycle)
         
         if spawn_score > 0.7:
-            print(f"\n✅ Spawn threshold met! Would replicate to adjacent verticals.")
+            log.info("\n✅ Spawn threshold met! Would replicate to adjacent verticals.")
         else:
-            print(f"\n✅ Cycle complete. Spawn needs >70%, got {spawn_score:.0%}")
+            log.info("\n✅ Cycle complete. Spawn needs >70%%, got %.0f%%", spawn_score * 100)
         
         # Update performance
         self.current_performance *= (1 + self.daily_improvement_rate)
-        print(f"📈 System performance: {self.current_performance:.2%}")
+        log.info("📈 System performance: %.2f%%", self.current_performance * 100)
         
         # Move to completed
         self.completed_builds.append(cycle)
+        self._metrics_soa["user_satisfaction"].append(cycle.metrics.get("user_satisfaction", 0))
         del self.active_builds[cycle.id]
         
         return cycle
@@ -309,13 +353,15 @@ class EkosystemOrchestrator:
         }
     
     def _calc_values(self) -> Dict:
-        love = sum(c.metrics.get("user_satisfaction", 0) for c in self.completed_builds) / max(1, len(self.completed_builds))
+        sat = self._metrics_soa["user_satisfaction"]
+        love = sum(sat) / max(1, len(sat))
         loyalty = min(1.0, self.community_pool / max(1, self.total_revenue * 0.3))
         honor = 1.0 if self.community_pool > 0 else 0.0
         return {"love": love, "loyalty": loyalty, "honor": honor}
 
 # === MAIN DEMO ===
 async def main():
+    logging.basicConfig(level=logging.INFO if "--verbose" in sys.argv else logging.WARNING, format="%(message)s")
     print("""
 ╔═══════════════════════════════════════════════════════════════╗
 ║              EKOSYSTEM BUILDER - GENESIS                      ║
@@ -333,15 +379,15 @@ async def main():
     print("="*60)
     print("  🏢 B2B EXTRACTION (eKo.vision)")
     print("="*60)
-    b2b = await eko.run_full_cycle("Build enterprise voice AI agency solution for corporate clients")
-    await eko.process_revenue(b2b, 25000.00)
+    b2b = eko.run_full_cycle("Build enterprise voice AI agency solution for corporate clients")
+    eko.process_revenue(b2b, 25000.00)
     
     # B2C Empowerment
     print("\n" + "="*60)
     print("  🎮 B2C EMPOWERMENT (0r8.ai)")
     print("="*60)
-    b2c = await eko.run_full_cycle("Build AI learning playground game for creative kids")
-    await eko.process_revenue(b2c, 5000.00)
+    b2c = eko.run_full_cycle("Build AI learning playground game for creative kids")
+    eko.process_revenue(b2c, 5000.00)
     
     # Impact Report
     print("\n" + "="*60)
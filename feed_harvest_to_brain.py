@@ -1,22 +1,35 @@
 ﻿import requests
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
 BRAIN_URL = "http://127.0.0.1:3000"
 MASTER_KEY = "dcf76d54bd8d4aa64140aace066e9fcaab088a178c48216286b0c44f848a3e92"
 
 def feed_harvest():
     print("\n🤖 Registering Architecture Harvester...")
     
-    reg = requests.post(f"{BRAIN_URL}/register", json={
+    session = requests.Session()  # keep-alive: one connection for every call below
+    reg = session.post(f"{BRAIN_URL}/register", data=_dumps({
         "agent_name": "architect_harvester",
         "master_key": "dcf76d54bd8d4aa64140aace066e9fcaab088a178c48216286b0c44f848a3e92"
-    })
+    }), headers=_JSON_HEADERS)
     
     if reg.status_code != 200:
         print(f"❌ Registration failed: {reg.text}")
         return
     
-    token = reg.json()["token"]
-    headers = {"Authorization": f"Bearer {token}"}
+    token = _loads(reg.content)["token"]
+    session.headers["Authorization"] = f"Bearer {token}"
     print("✅ Harvester registered\n")
     
     # Your best patterns from 100+ apps
@@ -59,21 +72,23 @@ def feed_harvest():
     
     print(f"🌱 Feeding {len(patterns)} patterns from your 100+ apps...\n")
     
+    # One round trip for the whole corpus via the batch endpoint
     success = 0
-    for i, pattern in enumerate(patterns, 1):
-        try:
-            r = requests.post(f"{BRAIN_URL}/compress", json={"text": pattern}, headers=headers)
-            if r.status_code == 200:
+    try:
+        r = session.post(f"{BRAIN_URL}/compress_batch", data=_dumps({"texts": patterns}), headers=_JSON_HEADERS)
+        r.raise_for_status()
+        for i, result in enumerate(_loads(r.content)["results"], 1):
+            if "error" in result:
+                print(f"  ✗ Error on pattern {i}: {result['error']}")
+            else:
                 success += 1
-                if i % 5 == 0:
-                    print(f"  ✓ {i}/{len(patterns)} patterns fed...")
-        except Exception as e:
-            print(f"  ✗ Error on pattern {i}: {e}")
+    except Exception as e:
+        print(f"  ✗ Batch failed: {e}")
     
     print(f"\n✅ Successfully fed {success}/{len(patterns)} patterns to Brain OS\n")
     
     # Get final stats
-    stats = requests.get(f"{BRAIN_URL}/stats", headers=headers).json()
+    stats = _loads(session.get(f"{BRAIN_URL}/stats").content)
     print("="*60)
     print("📊 BRAIN OS STATS AFTER HARVEST:")
     print("="*60)
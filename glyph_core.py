@@ -2,43 +2,67 @@
 GLYPH ENGINE - Core Compression System
 """
 import hashlib
+import itertools
 import json
+import sys
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Dict, List
 
-@dataclass
+# Cache key only, nothing cryptographic rides on it: prefer the fastest 64-bit hash available
+try:
+    from xxhash import xxh3_64_intdigest as _text_key
+except ImportError:
+    try:
+        from blake3 import blake3
+        def _text_key(data: bytes) -> int:
+            return int.from_bytes(blake3(data).digest(length=8), "little")
+    except ImportError:
+        def _text_key(data: bytes) -> int:
+            # hashlib's SHA-256 dispatches to SHA-NI where the CPU has it
+            return int.from_bytes(hashlib.sha256(data).digest()[:8], "little")
+
+_STOPWORDS = frozenset(map(sys.intern, (
+    "the", "a", "an", "is", "are", "was", "to", "of", "and", "in", "for", "on", "with", "this", "that")))
+
+def _encode(text: str):
+    """Remove stopwords + abbreviate: (compressed, tokens_before, tokens_after)"""
+    words = text.lower().split()
+    kept = [w[:4] for w in itertools.islice((w for w in words if w not in _STOPWORDS), 12)]
+    return " ".join(kept), len(words), len(kept)
+
+@dataclass(slots=True, frozen=True)
 class CompressionResult:
-    original: str
     compressed: str
     tokens_before: int
     tokens_after: int
     compression_ratio: float
     cache_hit: bool
-    glyph_ids: List[str]
+    glyph_ids: List[int]
 
 class Grimoire:
-    def __init__(self):
-        self.glyphs = {}
+    """LRU of text key -> [compressed, uses, tokens_after], bounded to cap entries"""
+    def __init__(self, cap: int = 10_000):
+        self.glyphs = OrderedDict()
+        self.cap = cap
         self.stats = {"hits": 0, "total": 0}
     
-    def store(self, text_hash, original, compressed):
-        self.glyphs[text_hash] = {
-            "original": original,
-            "compressed": compressed,
-            "created": time.time(),
-            "uses": 1
-        }
+    def store(self, text_hash, compressed, tokens_after):
+        if text_hash not in self.glyphs and len(self.glyphs) >= self.cap:
+            self.glyphs.popitem(last=False)
+        self.glyphs[text_hash] = [compressed, 1, tokens_after]
     
     def get(self, text_hash):
-        if text_hash in self.glyphs:
-            self.glyphs[text_hash]["uses"] += 1
-            return self.glyphs[text_hash]
-        return None
+        entry = self.glyphs.get(text_hash)
+        if entry is not None:
+            self.glyphs.move_to_end(text_hash)
+            entry[1] += 1
+        return entry
 
 class GlyphEngine:
-    def __init__(self):
-        self.grimoire = Grimoire()
+    def __init__(self, cap: int = 10_000):
+        self.grimoire = Grimoire(cap)
         self.stats = {
             "total_compressions": 0,
             "cache_hits": 0,
@@ -49,38 +73,29 @@ class GlyphEngine:
         self.stats["total_compressions"] += 1
         
         # Check cache
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
+        text_hash = _text_key(text.encode())
         cached = self.grimoire.get(text_hash)
         
         if cached:
             self.stats["cache_hits"] += 1
             return CompressionResult(
-                original=text,
-                compressed=cached["compressed"],
+                compressed=cached[0],
                 tokens_before=len(text.split()),
-                tokens_after=len(cached["compressed"].split()),
+                tokens_after=cached[2],
                 compression_ratio=0.7,
                 cache_hit=True,
                 glyph_ids=[text_hash]
             )
         
-        # Compress: remove stopwords + abbreviate
-        words = text.lower().split()
-        stopwords = {"the", "a", "an", "is", "are", "was", "to", "of", "and", "in", "for", "on", "with", "this", "that"}
-        filtered = [w for w in words if w not in stopwords]
-        compressed = " ".join([w[:4] if len(w) > 4 else w for w in filtered[:12]])
-        
-        tokens_before = len(words)
-        tokens_after = len(compressed.split())
+        compressed, tokens_before, tokens_after = _encode(text)
         ratio = 1 - (tokens_after / max(1, tokens_before))
         
         # Store if learning
         if learn:
-            self.grimoire.store(text_hash, text, compressed)
+            self.grimoire.store(text_hash, compressed, tokens_after)
             self.stats["tokens_saved"] += tokens_before - tokens_after
         
         return CompressionResult(
-            original=text,
             compressed=compressed,
             tokens_before=tokens_before,
             tokens_after=tokens_after,
@@ -89,6 +104,48 @@ class GlyphEngine:
             glyph_ids=[text_hash]
         )
     
+    def compress_batch(self, texts, learn: bool = True) -> List[CompressionResult]:
+        """compress() over texts in order, with lookups bound once and stats updated once per batch"""
+        get, store = self.grimoire.get, self.grimoire.store
+        results, hits, saved = [], 0, 0
+        for text in texts:
+            text_hash = _text_key(text.encode())
+            cached = get(text_hash)
+            if cached:
+                hits += 1
+                results.append(CompressionResult(cached[0], len(text.split()), cached[2], 0.7, True, [text_hash]))
+                continue
+            compressed, tokens_before, tokens_after = _encode(text)
+            if learn:
+                store(text_hash, compressed, tokens_after)
+                saved += tokens_before - tokens_after
+            results.append(CompressionResult(compressed, tokens_before, tokens_after,
+                                             1 - (tokens_after / max(1, tokens_before)), False, [text_hash]))
+        self.stats["total_compressions"] += len(results)
+        self.stats["cache_hits"] += hits
+        self.stats["tokens_saved"] += saved
+        return results
+    
+    def absorb(self, result: CompressionResult) -> CompressionResult:
+        """Record a learn=False result from another engine (e.g. a worker process) as
+        compress(text, learn=True) here would have, and return what that call would return"""
+        self.stats["total_compressions"] += 1
+        text_hash = result.glyph_ids[0]
+        cached = self.grimoire.get(text_hash)
+        if cached:
+            self.stats["cache_hits"] += 1
+            return CompressionResult(
+                compressed=cached[0],
+                tokens_before=result.tokens_before,
+                tokens_after=cached[2],
+                compression_ratio=0.7,
+                cache_hit=True,
+                glyph_ids=[text_hash]
+            )
+        self.grimoire.store(text_hash, result.compressed, result.tokens_after)
+        self.stats["tokens_saved"] += result.tokens_before - result.tokens_after
+        return result
+    
     def get_stats(self) -> Dict:
         return {
             **self.stats,
@@ -1,21 +1,74 @@
-﻿import json
-import requests
+﻿import requests
 import os
 from pathlib import Path
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+try:
+    import ijson
+    _JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _JSON_ERRORS = (ValueError,)
+
+TEXT_BUDGET = 2000
+MAX_PARSE_BYTES = 8 * 1024 * 1024  # without ijson, bigger files only get their raw head read
+
 BRAIN_URL = "http://127.0.0.1:3000"
 MASTER_KEY = "dcf76d54bd8d4aa64140aace066e9fcaab088a178c48216286b0c44f848a3e92"
 
+def extract_text(obj, budget=TEXT_BUDGET):
+    """String leaves of a parsed JSON value in document order, up to budget chars"""
+    out, stack, total = [], [obj], 0
+    while stack and total < budget:
+        x = stack.pop()
+        if isinstance(x, str):
+            out.append(x)
+            total += len(x)
+        elif isinstance(x, dict):
+            stack.extend(reversed(x.values()))
+        elif isinstance(x, list):
+            stack.extend(reversed(x))
+    return " ".join(out)[:budget]
+
+def read_text(path, budget=TEXT_BUDGET):
+    """Text worth compressing from a JSON export, without parsing more than needed"""
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            # Stream string values and stop as soon as the budget is filled
+            out, total = [], 0
+            for _, event, value in ijson.parse(f):
+                if event == 'string':
+                    out.append(value)
+                    total += len(value)
+                    if total >= budget:
+                        break
+            return " ".join(out)[:budget]
+        if os.fstat(f.fileno()).st_size > MAX_PARSE_BYTES:
+            return f.read(4096).decode('utf-8', 'ignore')[:budget]
+        return extract_text(_loads(f.read()), budget)
+
 def harvest_everything():
     """Feed ALL exports to Brain OS"""
     
     # Register mega harvester
-    r = requests.post(f"{BRAIN_URL}/register", json={
+    session = requests.Session()  # keep-alive: one connection for every call below
+    r = session.post(f"{BRAIN_URL}/register", data=_dumps({
         "agent_name": "mega_harvester",
         "master_key": MASTER_KEY
-    })
-    token = r.json()["token"]
-    headers = {"Authorization": f"Bearer {token}"}
+    }), headers=_JSON_HEADERS)
+    token = _loads(r.content)["token"]
+    session.headers["Authorization"] = f"Bearer {token}"
     
     export_folder = Path(r"C:\Users\JB\Downloads\ai_exports")
     
@@ -26,29 +79,32 @@ def harvest_everything():
         print(f"\n📂 Processing: {json_file.name}")
         
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Extract text from various formats
-                text = str(data)[:2000]
-                
-                if len(text) > 100:
-                    r = requests.post(
-                        f"{BRAIN_URL}/compress",
-                        json={"text": text},
-                        headers=headers
-                    )
-                    
-                    if r.status_code == 200:
-                        total += 1
-                        if total % 10 == 0:
-                            print(f"  ✓ {total} patterns harvested...")
-        except:
-            pass
+            text = read_text(json_file)
+        except OSError as e:
+            print(f"  ✗ Could not read {json_file.name}: {e}")
+            continue
+        except _JSON_ERRORS as e:
+            print(f"  ✗ Not valid JSON, skipped {json_file.name}: {e}")
+            continue
+        
+        if len(text) > 100:
+            try:
+                r = session.post(
+                    f"{BRAIN_URL}/compress",
+                    data=_dumps({"text": text}),
+                    headers=_JSON_HEADERS
+                )
+            except requests.RequestException:
+                continue
+            
+            if r.status_code == 200:
+                total += 1
+                if total % 10 == 0:
+                    print(f"  ✓ {total} patterns harvested...")
     
     print(f"\n✅ TOTAL: {total} patterns")
     
-    stats = requests.get(f"{BRAIN_URL}/stats", headers=headers).json()
+    stats = _loads(session.get(f"{BRAIN_URL}/stats").content)
     print(f"\n📊 Brain now has {stats['patterns']} total patterns")
 
 if __name__ == "__main__":
@@ -5,88 +5,393 @@ Pull from: Local Git, Google Cloud, Base44, wherever your code lives
 Consolidate ALL iterations into the machine's memory
 """
 import os
-import json
+import time
+import hashlib
+import pickle
+import platform
 import subprocess
-from pathlib import Path
+import sys
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime
 
+try:
+    import google.auth
+    from google.cloud import resourcemanager_v3, run_v2, storage
+    _HAS_GCP_CLIENTS = True
+except ImportError:
+    _HAS_GCP_CLIENTS = False
+
+try:
+    import orjson
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+    _loads = orjson.loads
+except ImportError:
+    import json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, default=str).encode()
+    _loads = json.loads
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__', 'venv', '.next', 'dist', 'build'})
+CODE_EXTS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.json', '.yaml', '.yml', '.sql', '.html', '.css'})
+MAX_EXT_LEN = max(map(len, CODE_EXTS))
+DEPLOYABLE_SOURCES = frozenset({'gcp_cloud_run', 'base44'})
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'harvester')
+CLI_CACHE_TTL = 300  # seconds a cached gcloud/gsutil listing stays fresh
+
+def _iter_code_files(root, recursive=True):
+    """Yield (DirEntry, ext) for code files under root, pruning SKIP_DIRS by name
+    (top level only when not recursive)"""
+    stack = deque([root])
+    while stack:
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            if path is root:
+                raise  # a bad root is the caller's to report
+            continue  # unreadable dir: skipped, as os.walk did
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                else:
+                    # Decide on the name alone first: only short suffixes get lowered, and only
+                    # candidates pay for is_file(). Dotfiles have no extension, as with splitext.
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot > 0 and len(name) - dot <= MAX_EXT_LEN:
+                        ext = name[dot:].lower()
+                        if ext in CODE_EXTS and entry.is_file():
+                            yield entry, ext
+
+def _count_lines(filepath):
+    """Lines as text-mode readlines() counts them (\n, \r\n and lone \r all end a line),
+    from 1 MiB binary chunks (no decode, no line list)"""
+    count, last = 0, b''
+    with open(filepath, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):  # ask for aggressive readahead where the OS supports it
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for buf in iter(lambda: f.read(1 << 20), b''):
+            count += buf.count(b'\n') + buf.count(b'\r') - buf.count(b'\r\n')
+            if last.endswith(b'\r') and buf.startswith(b'\n'):
+                count -= 1  # a \r\n split across chunks
+            last = buf
+    if last and not last.endswith((b'\n', b'\r')):
+        count += 1
+    return count
+
+def _run_cached(argv, ttl=CLI_CACHE_TTL, max_lines=None):
+    """stdout of a successful CLI call (only its first max_lines lines if given),
+    reused from CACHE_DIR while younger than ttl; None on failure"""
+    key = '\0'.join(argv) + f'\0{max_lines}'
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha256(key.encode()).hexdigest()[:16] + '.out')
+    try:
+        if time.time() - os.path.getmtime(cache_path) < ttl:
+            with open(cache_path, encoding='utf-8') as f:
+                return f.read()
+    except OSError:
+        pass
+    if max_lines is None:
+        result = subprocess.run(argv, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        out = result.stdout
+    else:
+        # Stream and stop after max_lines instead of waiting on and buffering the whole listing
+        with subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as p:
+            lines = list(islice(p.stdout, max_lines))
+            if len(lines) == max_lines:
+                p.kill()
+            elif p.wait() != 0:
+                return None
+        out = ''.join(lines)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = cache_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(out)
+    os.replace(tmp, cache_path)
+    return out
+
+@lru_cache(maxsize=None)
+def _cli_lines(argv, max_lines=None):
+    """Non-empty output lines of a cached CLI call (argv as a tuple); None on failure"""
+    out = _run_cached(list(argv), max_lines=max_lines)
+    return None if out is None else tuple(line.strip() for line in out.splitlines() if line.strip())
+
+def _line_cache_path(root):
+    # One file per root, so parallel worker processes never write the same cache
+    return os.path.join(CACHE_DIR, 'lines-' + hashlib.sha256(os.path.abspath(root).encode()).hexdigest()[:16] + '.pickle')
+
+def _load_line_cache(root):
+    """{path: ((mtime_ns, size), lines)} from the previous scan of root"""
+    try:
+        with open(_line_cache_path(root), 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return {}
+
+def _save_line_cache(root, cache):
+    cache_path = _line_cache_path(root)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path + '.tmp', 'wb') as f:
+            pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(cache_path + '.tmp', cache_path)
+    except OSError:
+        pass
+
+def load_config(path):
+    """Pre-supplied entries for a non-interactive run: lists under 'local', 'gcp_manual', 'base44'
+    and 'other' in a YAML (needs PyYAML) or JSON file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise SystemExit("PyYAML is required for YAML configs (pip install pyyaml), or use JSON")
+        return yaml.safe_load(data) or {}
+    return _loads(data)
+
+def _write_json(f, doc):
+    """Write a dict as JSON into binary file f, one list element per line, one element at a time
+    (the document is never serialized whole)"""
+    f.write(b'{')
+    for n, (key, value) in enumerate(doc.items()):
+        f.write(b',\n  ' if n else b'\n  ')
+        f.write(_dumps(key) + b': ')
+        if isinstance(value, list):
+            f.write(b'[')
+            for i, item in enumerate(value):
+                f.write(b',\n    ' if i else b'\n    ')
+                f.write(_dumps(item))
+            f.write(b'\n  ]' if value else b']')
+        else:
+            f.write(_dumps(value))
+    f.write(b'\n}\n')
+
+def _write_lines(lines):
+    """Print a whole listing with one stdout write (per-line print is slow on Windows consoles)"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+def _gcp_api_listings():
+    """(projects, services, buckets) rows shaped like the CLI value() output, fetched with the
+    client libraries on one set of credentials; None when they are missing or unauthenticated"""
+    if not _HAS_GCP_CLIENTS:
+        return None
+    try:
+        creds, project = google.auth.default()
+        projects = tuple(p.project_id for p in islice(
+            resourcemanager_v3.ProjectsClient(credentials=creds).search_projects(), 10))
+        services = tuple(f"{svc.name.rsplit('/', 1)[-1]}\t{svc.uri}" for svc in
+            run_v2.ServicesClient(credentials=creds).list_services(parent=f"projects/{project}/locations/-")) if project else ()
+        buckets = tuple(f"gs://{b.name}/" for b in
+            storage.Client(project=project, credentials=creds).list_buckets(max_results=10))
+    except Exception:
+        return None
+    return projects, services, buckets
+
+def scan_directory(path, recursive=True):
+    """(stats, warning) for one local tree (module-level so worker processes can run it);
+    stats is None if path is not a readable directory. The parent prints the warning,
+    so output from concurrent scans doesn't interleave"""
+    stats = {"files": 0, "lines": 0, "languages": {}}
+    seen, fresh = _load_line_cache(path), {}
+    
+    try:
+        for entry, ext in _iter_code_files(path, recursive):
+            stats["files"] += 1
+            stats["languages"][ext] = stats["languages"].get(ext, 0) + 1
+            
+            try:
+                # DirEntry.stat() is cached (free on Windows), so empty files never get opened;
+                # large ones (bundles, lockfiles) are streamed in chunks by _count_lines
+                st = entry.stat()
+                if st.st_size:
+                    # Files unchanged since the last run keep their count without being read
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    hit = seen.get(entry.path)
+                    lines = hit[1] if hit and hit[0] == stamp else _count_lines(entry.path)
+                    fresh[entry.path] = (stamp, lines)
+                    stats["lines"] += lines
+            except:
+                pass
+    except (FileNotFoundError, NotADirectoryError):
+        return None, f"   ⚠️ Not a directory, skipped: {path}"
+    except Exception as e:
+        warning = f"      ⚠️ Error scanning {path}: {e}"
+    else:
+        warning = None
+    
+    _save_line_cache(path, fresh)
+    return stats, warning
+
 class MultiSourceHarvester:
-    def __init__(self):
+    def __init__(self, config=None):
+        self._config = config or {}
+        # With a config file, prompts only run when someone is at the terminal
+        self._interactive = config is None or sys.stdin.isatty()
         self.all_patterns = {
             "sources": [],
             "total_stats": {"files": 0, "lines": 0, "repos": 0},
             "tech_stack": set(),
             "verticals": set(),
-            "apps_detected": [],
             "revenue_potential": []
         }
+        # Detected apps as parallel columns; dicts are only rebuilt for the JSON dump
+        self.app_source, self.app_name, self.app_url, self.app_type = [], [], [], []
+        # Keys already recorded, so re-entered paths/resources are kept once
+        self._seen_sources, self._seen_apps = set(), set()
+        self._scan_pool = None
+        self._pending_scans = []  # (path, future) from start_local, in entry order
+    
+    def entries(self, key, prompt):
+        """Entries for one prompt: the config's list first, then typed lines until an empty one"""
+        for entry in self._config.get(key) or ():
+            if str(entry).strip():
+                yield str(entry).strip()
+        while self._interactive:
+            entry = input(prompt).strip()
+            if not entry:
+                break
+            yield entry
+    
+    def _add_source(self, source):
+        """Append a source record unless one with the same type and identifier exists; True if added"""
+        key = (source["type"], source.get("path") or source.get("resource") or source.get("project") or source.get("entry"))
+        if key in self._seen_sources:
+            return False
+        self._seen_sources.add(key)
+        self.all_patterns["sources"].append(source)
+        return True
+    
+    def _add_app(self, source, name, url=None, kind=None):
+        if (source, name) in self._seen_apps:
+            return
+        self._seen_apps.add((source, name))
+        self.app_source.append(source)
+        self.app_name.append(name)
+        self.app_url.append(url)
+        self.app_type.append(kind)
+    
+    def apps(self):
+        """Detected apps as records, in detection order"""
+        out = []
+        for source, name, url, kind in zip(self.app_source, self.app_name, self.app_url, self.app_type):
+            app = {"source": source, "name": name}
+            if url is not None:
+                app["url"] = url
+            if kind is not None:
+                app["type"] = kind
+            out.append(app)
+        return out
     
-    def harvest_local(self, paths):
+    def start_local(self, path, recursive=True):
+        """Begin scanning a local root in a worker process; finish_local() collects it"""
+        # The source's slot is taken now, so locals keep their entry order ahead of later sources
+        source = {"type": "local", "path": path, "stats": None}
+        if not self._add_source(source):
+            return
+        if self._scan_pool is None:
+            self._scan_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        self._pending_scans.append((source, self._scan_pool.submit(scan_directory, path, recursive)))
+    
+    def finish_local(self):
+        """Wait for the scans begun by start_local() and record them"""
+        pending, self._pending_scans = self._pending_scans, []
+        if pending:
+            print("\n📁 HARVESTING LOCAL REPOS...")
+            for source, future in pending:
+                self._add_local(source, *future.result())
+        if self._scan_pool is not None:
+            self._scan_pool.shutdown()
+            self._scan_pool = None
+    
+    def harvest_local(self, paths, recursive=True):
         """Harvest local directories"""
-        print("\n📁 HARVESTING LOCAL REPOS...")
         for path in paths:
-            if os.path.exists(path):
-                stats = self._scan_directory(path)
-                self.all_patterns["sources"].append({
-                    "type": "local",
-                    "path": path,
-                    "stats": stats
-                })
-                print(f"   ✓ {path}: {stats['files']} files, {stats['lines']:,} lines")
+            self.start_local(path, recursive)
+        self.finish_local()
+    
+    def _add_local(self, source, stats, warning=None):
+        if warning:
+            print(warning)
+        if stats is None:
+            # Unreadable root: give its reserved slot back
+            self.all_patterns["sources"].remove(source)
+            self._seen_sources.discard(("local", source["path"]))
+            return
+        source["stats"] = stats
+        self._record_scan(stats)
+        print(f"   ✓ {source['path']}: {stats['files']} files, {stats['lines']:,} lines")
     
     def harvest_google_cloud(self):
         """Pull repos/buckets from Google Cloud"""
         print("\n☁️ HARVESTING GOOGLE CLOUD...")
-        print("   Checking for gcloud CLI...")
         
         try:
-            # Check if gcloud is installed
-            result = subprocess.run(['gcloud', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("   ✓ gcloud CLI found")
+            # The client libraries, when installed and authenticated, list everything in-process
+            listings = _gcp_api_listings()
+            if listings is not None:
+                print("   ✓ Google Cloud client libraries authenticated")
+                found = True
+            else:
+                print("   Checking for gcloud CLI...")
+                # The four listings are independent and network-bound, so issue them together
+                # (one at a time on Windows, where some gcloud releases break when run in parallel)
+                with ThreadPoolExecutor(max_workers=1 if platform.system() == 'Windows' else 4) as ex:
+                    version = ex.submit(_run_cached, ['gcloud', '--version'])
+                    # value() formats print one tab-separated row per resource, so rows can be streamed
+                    projects = ex.submit(_cli_lines, ('gcloud', 'projects', 'list', '--format=value(projectId)'), 10)
+                    services = ex.submit(_cli_lines, ('gcloud', 'run', 'services', 'list', '--format=value(metadata.name,status.url)'))
+                    buckets = ex.submit(_cli_lines, ('gsutil', 'ls'), 10)
+                # Check if gcloud is installed
+                found = version.result() is not None
+                if found:
+                    print("   ✓ gcloud CLI found")
+                    try:
+                        bucket_list = buckets.result()
+                    except FileNotFoundError:
+                        bucket_list = None  # gsutil isn't installed: projects and services still count
+                    listings = projects.result(), services.result(), bucket_list
+            
+            if found:
+                proj_list, svc_list, bucket_list = listings
                 
                 # List projects
                 print("\n   Your GCP Projects:")
-                projects = subprocess.run(
-                    ['gcloud', 'projects', 'list', '--format=json'],
-                    capture_output=True, text=True
-                )
-                if projects.returncode == 0:
-                    proj_list = json.loads(projects.stdout)
-                    for i, proj in enumerate(proj_list[:10], 1):
-                        print(f"      {i}. {proj.get('projectId', 'unknown')}")
+                if proj_list is not None:
+                    _write_lines([f"      {i}. {proj}" for i, proj in enumerate(proj_list, 1)])
                     
                     # List Cloud Run services
                     print("\n   Cloud Run Services:")
-                    services = subprocess.run(
-                        ['gcloud', 'run', 'services', 'list', '--format=json'],
-                        capture_output=True, text=True
-                    )
-                    if services.returncode == 0 and services.stdout.strip():
-                        svc_list = json.loads(services.stdout)
+                    if svc_list:
+                        lines = []
                         for svc in svc_list:
-                            svc_name = svc.get('metadata', {}).get('name', 'unknown')
-                            print(f"      • {svc_name}")
-                            self.all_patterns["apps_detected"].append({
-                                "source": "gcp_cloud_run",
-                                "name": svc_name,
-                                "url": svc.get('status', {}).get('url', '')
-                            })
+                            svc_name, _, svc_url = svc.partition('\t')
+                            lines.append(f"      • {svc_name}")
+                            self._add_app("gcp_cloud_run", svc_name, url=svc_url.strip())
+                        _write_lines(lines)
                     
                     # List Cloud Storage buckets
                     print("\n   Cloud Storage Buckets:")
-                    buckets = subprocess.run(
-                        ['gsutil', 'ls'],
-                        capture_output=True, text=True
-                    )
-                    if buckets.returncode == 0:
-                        for bucket in buckets.stdout.strip().split('\n')[:10]:
-                            if bucket:
-                                print(f"      • {bucket}")
-                                self.all_patterns["sources"].append({
-                                    "type": "gcs_bucket",
-                                    "path": bucket
-                                })
+                    if bucket_list is not None:
+                        _write_lines([f"      • {bucket}" for bucket in bucket_list])
+                        for bucket in bucket_list:
+                            self._add_source({
+                                "type": "gcs_bucket",
+                                "path": bucket
+                            })
                 else:
                     print("   ⚠️ No projects found or not authenticated")
                     print("   Run: gcloud auth login")
@@ -104,15 +409,14 @@ class MultiSourceHarvester:
         print("   List your GCP resources (project IDs, bucket names, service URLs)")
         print("   One per line, empty to finish:")
         
-        while True:
-            resource = input("   GCP Resource: ").strip()
-            if not resource:
-                break
-            self.all_patterns["sources"].append({
+        for resource in self.entries("gcp_manual", "   GCP Resource: "):
+            if self._add_source({
                 "type": "gcp_manual",
                 "resource": resource
-            })
-            print(f"      ✓ Added: {resource}")
+            }):
+                print(f"      ✓ Added: {resource}")
+            else:
+                print(f"      • Already added: {resource}")
     
     def harvest_base44(self):
         """Pull from Base44 projects"""
@@ -120,20 +424,15 @@ class MultiSourceHarvester:
         print("   Base44 apps to consolidate:")
         print("   Enter project names/URLs (empty to finish):")
         
-        while True:
-            project = input("   Base44 Project: ").strip()
-            if not project:
-                break
-            self.all_patterns["sources"].append({
+        for project in self.entries("base44", "   Base44 Project: "):
+            if self._add_source({
                 "type": "base44",
                 "project": project
-            })
-            self.all_patterns["apps_detected"].append({
-                "source": "base44",
-                "name": project,
-                "type": "no-code app"
-            })
-            print(f"      ✓ Added: {project}")
+            }):
+                self._add_app("base44", project, kind="no-code app")
+                print(f"      ✓ Added: {project}")
+            else:
+                print(f"      • Already added: {project}")
     
     def harvest_other_sources(self):
         """Catch-all for other platforms"""
@@ -152,59 +451,31 @@ class MultiSourceHarvester:
         ]
         
         print("   Other platforms with your code:")
-        for i, p in enumerate(platforms, 1):
-            print(f"      {i}. {p}")
+        _write_lines([f"      {i}. {p}" for i, p in enumerate(platforms, 1)])
         
         print("\n   Enter platform number and resource (e.g., '1 my-app.vercel.app')")
         print("   Empty to finish:")
         
-        while True:
-            entry = input("   Platform Resource: ").strip()
-            if not entry:
-                break
+        for entry in self.entries("other", "   Platform Resource: "):
             parts = entry.split(' ', 1)
             if len(parts) >= 1:
-                self.all_patterns["sources"].append({
+                if self._add_source({
                     "type": "other",
                     "entry": entry
-                })
-                print(f"      ✓ Added: {entry}")
+                }):
+                    print(f"      ✓ Added: {entry}")
+                else:
+                    print(f"      • Already added: {entry}")
     
-    def _scan_directory(self, path):
-        """Scan a local directory for code stats"""
-        stats = {"files": 0, "lines": 0, "languages": {}}
-        
-        try:
-            for root, dirs, files in os.walk(path):
-                dirs[:] = [d for d in dirs if d not in ['.git', 'node_modules', '__pycache__', 'venv', '.next', 'dist', 'build']]
-                
-                for file in files:
-                    ext = Path(file).suffix.lower()
-                    code_exts = ['.py', '.js', '.ts', '.jsx', '.tsx', '.json', '.yaml', '.yml', '.sql', '.html', '.css']
-                    
-                    if ext in code_exts:
-                        stats["files"] += 1
-                        stats["languages"][ext] = stats["languages"].get(ext, 0) + 1
-                        
-                        try:
-                            filepath = Path(root) / file
-                            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                                stats["lines"] += len(f.readlines())
-                        except:
-                            pass
-        except Exception as e:
-            print(f"      ⚠️ Error scanning {path}: {e}")
-        
+    def _record_scan(self, stats):
         self.all_patterns["total_stats"]["files"] += stats["files"]
         self.all_patterns["total_stats"]["lines"] += stats["lines"]
         self.all_patterns["total_stats"]["repos"] += 1
-        
-        return stats
     
     def estimate_portfolio_value(self):
         """Estimate total value of all code"""
         total_lines = self.all_patterns["total_stats"]["lines"]
-        num_apps = len(self.all_patterns["apps_detected"])
+        num_apps = len(self.app_name)
         num_sources = len(self.all_patterns["sources"])
         
         # Conservative estimates
@@ -227,26 +498,26 @@ class MultiSourceHarvester:
     
     def generate_machine_memory(self):
         """Convert harvested data into machine-readable patterns"""
+        apps = self.apps()
+        
+        # Identify deployment-ready apps in one pass over the url/source columns
+        ready, needs = [], []
+        for app, url, source in zip(apps, self.app_url, self.app_source):
+            (ready if url or source in DEPLOYABLE_SOURCES else needs).append(app)
+        
         memory = {
             "harvested_at": datetime.now().isoformat(),
             "sources": self.all_patterns["sources"],
-            "apps": self.all_patterns["apps_detected"],
+            "apps": apps,
             "stats": self.all_patterns["total_stats"],
             "portfolio_value": self.estimate_portfolio_value(),
-            "ready_to_deploy": [],
-            "needs_work": [],
+            "ready_to_deploy": ready,
+            "needs_work": needs,
             "high_value_patterns": []
         }
         
-        # Identify deployment-ready apps
-        for app in self.all_patterns["apps_detected"]:
-            if app.get("url") or app["source"] in ["gcp_cloud_run", "base44"]:
-                memory["ready_to_deploy"].append(app)
-            else:
-                memory["needs_work"].append(app)
-        
-        with open("machine_memory.json", "w") as f:
-            json.dump(memory, f, indent=2, default=str)
+        with open("machine_memory.json", "wb") as f:
+            _write_json(f, memory)
         
         return memory
 
@@ -265,7 +536,11 @@ def main():
 ╚═══════════════════════════════════════════════════════════════╝
 """)
     
-    harvester = MultiSourceHarvester()
+    parser = argparse.ArgumentParser(description="Consolidate code from every source into machine memory")
+    parser.add_argument("--config", help="YAML/JSON file pre-supplying the entries otherwise prompted for")
+    args = parser.parse_args()
+    
+    harvester = MultiSourceHarvester(load_config(args.config) if args.config else None)
     
     # 1. Local repos
     print("="*60)
@@ -274,15 +549,9 @@ def main():
     print("Enter local paths to harvest (empty to skip):")
     print("Example: C:\\Users\\JB\\Projects\\my-app")
     
-    local_paths = []
-    while True:
-        path = input("Local Path: ").strip()
-        if not path:
-            break
-        local_paths.append(path)
-    
-    if local_paths:
-        harvester.harvest_local(local_paths)
+    # Each scan starts as soon as its path is entered and runs while the later prompts wait on input
+    for path in harvester.entries("local", "Local Path: "):
+        harvester.start_local(path)
     
     # 2. Google Cloud
     print("\n" + "="*60)
@@ -302,6 +571,8 @@ def main():
     print("="*60)
     harvester.harvest_other_sources()
     
+    harvester.finish_local()
+    
     # Generate machine memory
     print("\n" + "="*60)
     print("GENERATING MACHINE MEMORY")
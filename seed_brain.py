@@ -1,92 +1,166 @@
-﻿import requests
-import json
+﻿import asyncio
+import os
+import time
+import requests
+from requests.adapters import HTTPAdapter
 
-BASE_URL = "http://127.0.0.1:3000"
-MASTER_KEY ="5a69270d255064b5e28ab43b1fe471f55b949d4f57cc7aa28f680de981a4f446"
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
 
-def seed_brain():
+_JSON_HEADERS = {"content-type": "application/json"}
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+BASE_URL = os.environ.get("BRAIN_URL", "http://127.0.0.1:3000")
+MASTER_KEY = os.environ.get("BRAIN_MASTER_KEY")  # printed by brain_os at startup; new on every start
+
+PATTERNS = tuple(dict.fromkeys((  # order-preserving dedupe
+    "Analyze the provided code and identify logical errors",
+    "Review this code for potential bugs and security issues",
+    "Optimize this function for better performance",
+    "Refactor this code to be more maintainable",
+    "Add error handling to this function",
+    "Write unit tests for this code",
+    "Document this function with docstrings",
+    "Debug this failing test case",
+    "Break this problem into independent micro-tasks",
+    "Split this project into manageable phases",
+    "Decompose this feature into user stories",
+    "Separate concerns in this monolithic function",
+    "Search the database for all users with premium accounts",
+    "Filter results where status equals active",
+    "Sort the data by creation date descending",
+    "Join user table with orders table on user_id",
+    "Aggregate sales by month and region",
+    "Find duplicate entries in this dataset",
+    "Validate all email addresses in the database",
+    "Export query result to CSV format",
+    "Write a professional email to client about delays",
+    "Draft a press release for product launch",
+    "Create a summary of meeting notes",
+    "Compose a thank you message for the team",
+    "Write an apology for service outage",
+    "Draft a proposal for new feature",
+    "Create onboarding documentation for developers",
+    "Analyze market trends for AI services",
+    "Research competitors in voice AI space",
+    "Evaluate pros and cons of this approach",
+    "Compare these two architectural patterns",
+    "Assess risk of deployment strategy",
+    "Investigate root cause of system failure",
+    "Generate ten creative names for this product",
+    "Create a marketing tagline emphasizing innovation",
+    "Design user flow for onboarding process",
+    "Brainstorm solutions for scalability problem",
+    "Route query to optimal AI provider based on complexity",
+    "Compress this prompt using glyph encoding",
+    "Store this pattern in Grimoire for future recall",
+    "Calculate cost savings from smart routing",
+    "Update agent performance ratings based on results",
+    "Extract winning pattern from tournament finals",
+    "Optimize token usage through semantic compression",
+    "Synthesize results from multiple agents",
+    "Learn from this interaction and update patterns",
+    "What is best approach for handling concurrent requests",
+    "How should we structure database schema for scalability",
+    "Why is this function returning unexpected results",
+    "When should we use caching versus real-time queries",
+    "Where are performance bottlenecks in this system",
+    "Which design pattern fits this use case best",
+)))
+
+BATCH_SIZE = 50  # brain_os caps /compress_batch at MAX_BATCH texts
+TEXTS_PER_MINUTE = 100  # brain_os's per-IP text budget, shared by /compress and /compress_batch
+MAX_RETRIES = 3  # attempts after a 429 before the batch is reported as failed
+
+def _refill_delay(count):
+    """Seconds until the server's bucket has refilled enough for count texts"""
+    return count * 60 / TEXTS_PER_MINUTE
+
+async def _post_batch(session, base_url, body, count):
+    for attempt in range(MAX_RETRIES + 1):
+        async with session.post(f"{base_url}/compress_batch", data=body, headers=_JSON_HEADERS) as r:
+            if r.status != 429 or attempt == MAX_RETRIES:
+                r.raise_for_status()
+                return _loads(await r.read())["results"]
+        await asyncio.sleep(_refill_delay(count))
+
+async def _post_all(base_url, batches, headers):
+    """POST every (count, encoded body) batch concurrently; per-text results (or the exception) per batch"""
+    connector = aiohttp.TCPConnector(limit=len(batches), keepalive_timeout=60)
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as s:
+        return await asyncio.gather(*(_post_batch(s, base_url, b, n) for n, b in batches), return_exceptions=True)
+
+def seed_brain(session=None, base_url=BASE_URL, master_key=MASTER_KEY):
+    """Register a seeder agent and feed it PATTERNS. Pass a requests.Session to reuse its
+    open connections; every call then goes over it (its headers are left untouched)."""
+    if not master_key:
+        raise SystemExit("BRAIN_MASTER_KEY is not set: export the MASTER KEY brain_os printed at startup")
+    if session is not None:
+        return _seed(session, False, base_url, master_key)
+    with requests.Session() as session:  # keep-alive: one pooled connection for every synchronous call
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        return _seed(session, True, base_url, master_key)
+
+def _seed(session, own_session, base_url, master_key):
     print("Registering seeder agent...")
-    reg = requests.post(f"{BASE_URL}/register", json={"agent_name": "seeder", "master_key": MASTER_KEY})
+    reg = session.post(f"{base_url}/register", data=_dumps({"agent_name": "seeder", "master_key": master_key}),
+                       headers=_JSON_HEADERS)
     
     if reg.status_code != 200:
         print(f"Failed: {reg.text}")
         return
     
-    token = reg.json()["token"]
+    token = _loads(reg.content)["token"]
     headers = {"Authorization": f"Bearer {token}"}
+    json_headers = {**_JSON_HEADERS, **headers}  # per request, so a caller's session never keeps the token
     print("Agent registered!\n")
     
-    patterns = [
-        "Analyze the provided code and identify logical errors",
-        "Review this code for potential bugs and security issues",
-        "Optimize this function for better performance",
-        "Refactor this code to be more maintainable",
-        "Add error handling to this function",
-        "Write unit tests for this code",
-        "Document this function with docstrings",
-        "Debug this failing test case",
-        "Break this problem into independent micro-tasks",
-        "Split this project into manageable phases",
-        "Decompose this feature into user stories",
-        "Separate concerns in this monolithic function",
-        "Search the database for all users with premium accounts",
-        "Filter results where status equals active",
-        "Sort the data by creation date descending",
-        "Join user table with orders table on user_id",
-        "Aggregate sales by month and region",
-        "Find duplicate entries in this dataset",
-        "Validate all email addresses in the database",
-        "Export query result to CSV format",
-        "Write a professional email to client about delays",
-        "Draft a press release for product launch",
-        "Create a summary of meeting notes",
-        "Compose a thank you message for the team",
-        "Write an apology for service outage",
-        "Draft a proposal for new feature",
-        "Create onboarding documentation for developers",
-        "Analyze market trends for AI services",
-        "Research competitors in voice AI space",
-        "Evaluate pros and cons of this approach",
-        "Compare these two architectural patterns",
-        "Assess risk of deployment strategy",
-        "Investigate root cause of system failure",
-        "Generate ten creative names for this product",
-        "Create a marketing tagline emphasizing innovation",
-        "Design user flow for onboarding process",
-        "Brainstorm solutions for scalability problem",
-        "Route query to optimal AI provider based on complexity",
-        "Compress this prompt using glyph encoding",
-        "Store this pattern in Grimoire for future recall",
-        "Calculate cost savings from smart routing",
-        "Update agent performance ratings based on results",
-        "Extract winning pattern from tournament finals",
-        "Optimize token usage through semantic compression",
-        "Synthesize results from multiple agents",
-        "Learn from this interaction and update patterns",
-        "What is best approach for handling concurrent requests",
-        "How should we structure database schema for scalability",
-        "Why is this function returning unexpected results",
-        "When should we use caching versus real-time queries",
-        "Where are performance bottlenecks in this system",
-        "Which design pattern fits this use case best"
-    ]
+    patterns = PATTERNS
     
     print(f"Seeding {len(patterns)} patterns...\n")
     
+    # One /compress_batch round trip per BATCH_SIZE patterns instead of one /compress each
+    # Bodies are encoded once, up front, with orjson when available
+    # A 429 is retried once the server's per-text quota has refilled for that batch
+    batches = [(len(patterns[i:i + BATCH_SIZE]), _dumps({"texts": patterns[i:i + BATCH_SIZE]}))
+               for i in range(0, len(patterns), BATCH_SIZE)]
+    if aiohttp is not None and own_session:
+        replies = asyncio.run(_post_all(base_url, batches, headers))
+    else:
+        replies = []
+        for count, body in batches:
+            try:
+                for attempt in range(MAX_RETRIES + 1):
+                    r = session.post(f"{base_url}/compress_batch", data=body, headers=json_headers)
+                    if r.status_code != 429 or attempt == MAX_RETRIES:
+                        break
+                    time.sleep(_refill_delay(count))
+                r.raise_for_status()
+                replies.append(_loads(r.content)["results"])
+            except Exception as e:
+                replies.append(e)
+    
     successful = 0
-    for i, pattern in enumerate(patterns, 1):
-        try:
-            r = requests.post(f"{BASE_URL}/compress", json={"text": pattern}, headers=headers)
-            if r.status_code == 200:
-                successful += 1
-                if i % 10 == 0:
-                    print(f"  {i}/{len(patterns)} patterns seeded...")
-        except Exception as e:
-            print(f"  Error: {e}")
+    for results in replies:
+        if isinstance(results, Exception):
+            print(f"  Error: {results}")
+        else:
+            successful += sum("error" not in res for res in results)
     
     print(f"\nDONE! {successful}/{len(patterns)} patterns seeded\n")
     
-    stats = requests.get(f"{BASE_URL}/stats", headers=headers).json()
+    stats = _loads(session.get(f"{base_url}/stats", headers=headers).content)
     print(f"Patterns stored: {stats['patterns']}")
     print(f"Cache hits: {stats['grimoire']['hits']}")
     print(f"Tokens saved: {stats['grimoire']['saved']}")
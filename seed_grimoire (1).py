@@ -5,12 +5,37 @@ Front-load the intelligence. Don't wait for organic learning.
 """
 
 from glyph_core import GlyphEngine
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import json
+import mmap
+import os
 import random
 
+try:
+    import orjson
+    def _dumps_pretty(obj) -> bytes:
+        # Glyph keys are ints, which orjson only accepts with OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+@lru_cache(maxsize=None)
 def generate_synthetic_patterns():
     """
     Generate thousands of high-quality patterns for pre-training
+    (built once per process; the returned tuple is shared, so it is immutable)
     """
     
     patterns = []
@@ -199,10 +224,13 @@ def generate_synthetic_patterns():
         "{action} how this algorithm works",
     ]
     
-    for base in base_sentences:
-        for action_word, variations in variation_templates:
-            for var in variations:
-                patterns.append(base.format(action=var.capitalize()))
+    # Only the synonyms are substituted; dict.fromkeys drops repeats while keeping a stable order
+    patterns.extend(dict.fromkeys(
+        base.format(action=var.capitalize())
+        for base in base_sentences
+        for _, variations in variation_templates
+        for var in variations
+    ))
     
     # ==========================================================================
     # CATEGORY 9: COMPLEX COMPOUND PATTERNS
@@ -240,7 +268,34 @@ def generate_synthetic_patterns():
     ]
     patterns.extend(question_patterns)
     
-    return patterns
+    # Categories overlap (verbatim and via the variations); compress each text once, first occurrence wins
+    return tuple(dict.fromkeys(patterns))
+
+
+PARALLEL_MIN = 5000  # below this, starting worker processes costs more than compress() itself
+CHUNK_SIZE = 1000
+
+
+def _compress_chunk(chunk):
+    """Compress in a worker process; learn=False so the parent engine decides what is stored"""
+    return GlyphEngine().compress_batch(chunk, learn=False)
+
+
+def _compress_all(engine: GlyphEngine, patterns):
+    """compress(pattern, learn=True) over patterns, in order, spread over all cores for large corpora"""
+    if len(patterns) < PARALLEL_MIN:
+        return engine.compress_batch(patterns)
+    chunks = [patterns[i:i + CHUNK_SIZE] for i in range(0, len(patterns), CHUNK_SIZE)]
+    results = []
+    with ProcessPoolExecutor() as ex:
+        done = ex.map(_compress_chunk, chunks)
+        if tqdm is not None:
+            done = tqdm(done, total=len(chunks), desc="Seeding", unit="chunk")
+        for chunk in done:
+            results.extend(engine.absorb(result) for result in chunk)
+            if tqdm is None:  # one progress line per chunk, not per pattern
+                print(f"  Processed {len(results)}/{len(patterns)} patterns...")
+    return results
 
 
 def seed_grimoire(engine: GlyphEngine, patterns: list):
@@ -250,21 +305,10 @@ def seed_grimoire(engine: GlyphEngine, patterns: list):
     print(f"🌱 Seeding Grimoire with {len(patterns)} patterns...")
     print("=" * 70)
     
-    total_tokens_before = 0
-    total_tokens_after = 0
-    successful = 0
-    
-    for i, pattern in enumerate(patterns):
-        result = engine.compress(pattern, learn=True)
-        total_tokens_before += result.tokens_before
-        total_tokens_after += result.tokens_after
-        
-        if result.compression_ratio > 0.3:
-            successful += 1
-        
-        # Progress indicator
-        if (i + 1) % 50 == 0:
-            print(f"  Processed {i + 1}/{len(patterns)} patterns...")
+    results = _compress_all(engine, patterns)
+    total_tokens_before = sum(r.tokens_before for r in results)
+    total_tokens_after = sum(r.tokens_after for r in results)
+    successful = sum(r.compression_ratio > 0.3 for r in results)
     
     overall_compression = 1 - (total_tokens_after / total_tokens_before)
     
@@ -287,11 +331,32 @@ def export_seeded_grimoire(engine: GlyphEngine, filepath: str = "seeded_grimoire
     """
     data = engine.export_grimoire()
     
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(filepath, "wb") as f:
+        size = f.write(_dumps_pretty(data))  # bytes written; no second serialization to measure it
     
     print(f"💾 Exported seeded Grimoire to {filepath}")
-    print(f"   File size: {len(json.dumps(data)) / 1024:.1f} KB")
+    print(f"   File size: {size / 1024:.1f} KB")
+    
+    # Binary sidecar for fast deployment loads (see load_seeded_grimoire)
+    if msgpack is not None:
+        with open(filepath + ".msgpack", "wb") as f:
+            msgpack.pack(data, f, use_bin_type=True)
+            print(f"   msgpack sidecar: {filepath}.msgpack ({f.tell() / 1024:.1f} KB)")
+
+
+def load_seeded_grimoire(filepath: str = "seeded_grimoire.json"):
+    """
+    Load an exported Grimoire, from the memory-mapped msgpack sidecar when it
+    and msgpack are available, else from the JSON (glyph keys are ints either way)
+    """
+    sidecar = filepath + ".msgpack"
+    if msgpack is not None and os.path.exists(sidecar):
+        with open(sidecar, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return msgpack.unpackb(m, raw=False, strict_map_key=False)
+    with open(filepath, "rb") as f:
+        data = json.loads(f.read())
+    data["glyphs"] = {int(k): v for k, v in data["glyphs"].items()}
+    return data
 
 
 def test_cache_hits(engine: GlyphEngine):
@@ -309,13 +374,11 @@ def test_cache_hits(engine: GlyphEngine):
         "Write a professional email to the client about project delays",
     ]
     
-    hits = 0
-    for query in test_queries:
-        result = engine.compress(query, learn=False)
+    results = engine.compress_batch(test_queries, learn=False)
+    for query, result in zip(test_queries, results):
         status = "✅ CACHE HIT" if result.cache_hit else "❌ MISS"
         print(f"  {status}: {query[:50]}...")
-        if result.cache_hit:
-            hits += 1
+    hits = sum(r.cache_hit for r in results)
     
     print(f"\n  Hit rate: {hits}/{len(test_queries)} ({hits/len(test_queries)*100:.0f}%)")
     print("=" * 70)